@@ -1,20 +1,197 @@
 # Bosai Watch init
-from homeassistant.core import HomeAssistant
+import asyncio
+import logging
+from pathlib import Path
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_track_time_interval
 
+from .areas import async_get_area_index
+from .const import (
+    ALERT_WINDOW,
+    AREA_CODE,
+    AREA_SENSOR_IDS,
+    CONF_AREA_CODE,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+    MAX_CONNECTIONS,
+    MAX_CONNECTIONS_PER_HOST,
+    QUAKE_HISTORY_URL,
+    QUAKE_STREAM_URL,
+)
+from .coordinator import BosaiDataHub
+from .history import FLUSH_INTERVAL, HISTORY_DIR, HistoryStore
+from .item_index import SeenItemIndex
+from .keywords import HAZARD_MATCHER
+from .metrics import create_metric_graph
+from .quake_stream import QuakeStream
+from .response_cache import ResponseCache
 from .secrets import load_secrets
 
+_LOGGER = logging.getLogger(__name__)
+
 DOMAIN = 'bosai_watch'
 
 PLATFORMS = ["sensor"]
 
+
+def _create_session() -> aiohttp.ClientSession:
+    """Create the pooled HTTP session shared by every Bosai Watch entity."""
+    connector = aiohttp.TCPConnector(
+        limit=MAX_CONNECTIONS,
+        limit_per_host=MAX_CONNECTIONS_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+    )
+    return aiohttp.ClientSession(connector=connector)
+
+
+async def _async_acquire_pipeline(hass: HomeAssistant, entry_id: str) -> dict:
+    """Return the fetch pipeline shared by all entries, creating it if needed.
+
+    One session, hub, response cache and quake stream serve every config
+    entry, so each feed is fetched once however many areas are configured.
+    The first entry to acquire it owns the nationwide sensors.
+    """
+    domain_data = hass.data[DOMAIN]
+    async with domain_data.setdefault("pipeline_lock", asyncio.Lock()):
+        pipeline = domain_data.get("pipeline")
+        if pipeline is None:
+            secrets = domain_data["secrets"]
+            session = _create_session()
+            response_cache = ResponseCache(
+                hass, Path(hass.config.path(".storage", f"{DOMAIN}.responses"))
+            )
+            hub = BosaiDataHub(hass, session, response_cache)
+            await hub.async_restore()
+            quake_stream = QuakeStream(
+                hass,
+                session,
+                secrets.get("quake_stream_url", QUAKE_STREAM_URL),
+                secrets.get("quake_history_url", QUAKE_HISTORY_URL),
+            )
+
+            async def _async_close_session(_event: Event) -> None:
+                await quake_stream.async_stop()
+                await response_cache.async_save()
+                await session.close()
+
+            pipeline = domain_data["pipeline"] = {
+                "session": session,
+                "hub": hub,
+                "quake_stream": quake_stream,
+                "entries": set(),
+                "national_entry": entry_id,
+                "unsub_close": hass.bus.async_listen_once(
+                    EVENT_HOMEASSISTANT_CLOSE, _async_close_session
+                ),
+            }
+        pipeline["entries"].add(entry_id)
+    return pipeline
+
+
+async def _async_release_pipeline(hass: HomeAssistant, entry_id: str) -> None:
+    """Drop an entry from the shared pipeline and close it after the last one."""
+    domain_data = hass.data[DOMAIN]
+    async with domain_data["pipeline_lock"]:
+        pipeline = domain_data["pipeline"]
+        pipeline["entries"].discard(entry_id)
+        if pipeline["entries"]:
+            if pipeline["national_entry"] == entry_id:
+                # Hand the nationwide sensors over to a remaining entry
+                successor = pipeline["national_entry"] = next(iter(pipeline["entries"]))
+                hass.config_entries.async_schedule_reload(successor)
+            return
+        del domain_data["pipeline"]
+        pipeline["unsub_close"]()
+        pipeline["hub"].async_shutdown()
+        await pipeline["quake_stream"].async_stop()
+        await pipeline["hub"].response_cache.async_save()
+        await pipeline["session"].close()
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    """Set up Bosai Watch from a config entry."""
+    """Set up Bosai Watch from a config entry.
+
+    Only per-area state lives with the entry; fetching is shared through
+    the pipeline in ``hass.data[DOMAIN]["pipeline"]``.
+    """
     hass.data.setdefault(DOMAIN, {})
     hass.data[DOMAIN]["secrets"] = load_secrets(hass)
+    area_code = entry.data.get(CONF_AREA_CODE, AREA_CODE)
+    area = (await async_get_area_index(hass)).get(area_code)
+    if area is None:
+        _LOGGER.warning(f"Unknown JMA area code {area_code}; reports will not be filtered by area")
+    item_index = SeenItemIndex(
+        hass,
+        f"{DOMAIN}.{entry.entry_id}.seen_items",
+        HAZARD_MATCHER,
+        ALERT_WINDOW.total_seconds(),
+    )
+    await item_index.async_load()
+    history = HistoryStore(hass, Path(hass.config.path(HISTORY_DIR, entry.entry_id)))
+    await history.async_restore_recent()
+    pipeline = await _async_acquire_pipeline(hass, entry.entry_id)
+    hass.data[DOMAIN][entry.entry_id] = {
+        "item_index": item_index,
+        "metrics": create_metric_graph(),
+        "history": history,
+        "area": area,
+    }
+
+    async def _async_flush_history(_now) -> None:
+        await history.async_flush()
+
+    entry.async_on_unload(
+        async_track_time_interval(hass, _async_flush_history, FLUSH_INTERVAL)
+    )
+
+    async def _async_flush_on_close(_event: Event) -> None:
+        await history.async_flush()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_flush_on_close)
+    )
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    pipeline["quake_stream"].async_start()
     return True
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data["history"].async_flush()
+        await _async_release_pipeline(hass, entry.entry_id)
+    return unload_ok
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Scope per-area entity ids to their entry and key entries by area code."""
+    if entry.version == 1:
+        prefix = f"{DOMAIN}_"
+
+        @callback
+        def _migrate_unique_id(entity_entry: er.RegistryEntry) -> dict | None:
+            if not entity_entry.unique_id.startswith(prefix):
+                return None
+            sensor_id = entity_entry.unique_id[len(prefix):]
+            if sensor_id not in AREA_SENSOR_IDS:
+                return None
+            return {"new_unique_id": f"{entry.entry_id}_{sensor_id}"}
+
+        await er.async_migrate_entries(hass, entry.entry_id, _migrate_unique_id)
+        # Entries are unique per area code, as the config flow now enforces.
+        # When two old entries share an area only the first one claims it.
+        unique_id = entry.unique_id
+        area_code = entry.data.get(CONF_AREA_CODE, AREA_CODE)
+        if unique_id is None and not any(
+            other.unique_id == area_code for other in hass.config_entries.async_entries(DOMAIN)
+        ):
+            unique_id = area_code
+        hass.config_entries.async_update_entry(entry, unique_id=unique_id, version=2)
+    return True
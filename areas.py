@@ -0,0 +1,189 @@
+"""JMA area hierarchy: regional centers, offices and their sub-areas.
+
+The hierarchy runs centers → offices → class10s → class15s → class20s
+(municipalities). It is loaded once, on first use, from the compact index
+bundled in ``data/jma_areas.json`` (see ``scripts/build_area_index.py``).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Iterable, NamedTuple
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+AREA_INDEX_FILE = Path(__file__).resolve().parent / "data" / "jma_areas.json"
+
+# Warning statuses in JMA warning data that mean nothing is in force
+INACTIVE_WARNING_STATUSES = frozenset({"解除", "発表警報・注意報はなし"})
+
+
+class Area(NamedTuple):
+    """One area of the JMA hierarchy."""
+
+    code: str
+    level: str
+    parent: str | None
+    name: str
+    en_name: str
+
+
+class AreaIndex:
+    """Constant-time lookup of areas, their parents and their children.
+
+    A few codes are used at more than one level (``011000`` is both the
+    Kyushu South center and the Soya office); :meth:`get` resolves such a
+    code to the most specific area, while parent links stay exact.
+    """
+
+    def __init__(self, rows: Iterable[list], levels: list[str], prefectures: dict[str, str]) -> None:
+        self._levels = {level: depth for depth, level in enumerate(levels)}
+        self._by_level: list[dict[str, Area]] = [{} for _ in levels]
+        self._areas: dict[str, Area] = {}
+        self._children: dict[tuple[int, str], list[Area]] = {}
+        self._prefectures = prefectures
+        self._related: dict[str, frozenset[str]] = {}
+        for code, depth, parent, name, en_name in sorted(rows, key=lambda row: row[1]):
+            area = Area(code, levels[depth], parent or None, name, en_name)
+            self._by_level[depth][code] = area
+            self._areas[code] = area
+            if parent:
+                self._children.setdefault((depth - 1, parent), []).append(area)
+
+    @classmethod
+    def from_file(cls, path: Path = AREA_INDEX_FILE) -> AreaIndex:
+        """Load a compact index. This does blocking I/O."""
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(data["areas"], data["levels"], data["prefectures"])
+
+    def __contains__(self, code: object) -> bool:
+        return code in self._areas
+
+    def __len__(self) -> int:
+        return sum(len(areas) for areas in self._by_level)
+
+    def get(self, code: str) -> Area | None:
+        return self._areas.get(code)
+
+    def parent(self, area: Area) -> Area | None:
+        if area.parent is None:
+            return None
+        return self._by_level[self._levels[area.level] - 1].get(area.parent)
+
+    def children(self, area: Area) -> list[Area]:
+        return self._children.get((self._levels[area.level], area.code), [])
+
+    def ancestors(self, area: Area) -> list[Area]:
+        """Return the areas containing ``area``, nearest first."""
+        ancestors = []
+        parent = self.parent(area)
+        while parent is not None:
+            ancestors.append(parent)
+            parent = self.parent(parent)
+        return ancestors
+
+    def descendants(self, area: Area) -> list[Area]:
+        """Return every area within ``area``."""
+        found = []
+        pending = list(self.children(area))
+        while pending:
+            child = pending.pop()
+            found.append(child)
+            pending.extend(self.children(child))
+        return found
+
+    def office_of(self, code: str) -> Area | None:
+        """Return the forecast office responsible for ``code``."""
+        area = self.get(code)
+        while area is not None and area.level != "offices":
+            area = self.parent(area)
+        return area
+
+    def prefecture_of(self, code: str) -> str | None:
+        """Return the prefecture name for an office or sub-area code."""
+        area = self.get(code)
+        if area is None or area.level == "centers":
+            return None
+        return self._prefectures.get(code[:2])
+
+    def related_codes(self, code: str) -> frozenset[str]:
+        """Return ``code`` with the codes of the areas containing it or within it.
+
+        A report issued for any of these areas concerns ``code``. Regional
+        centers are left out unless ``code`` is one, as reports are not
+        issued for them. Computed once per code.
+        """
+        related = self._related.get(code)
+        if related is None:
+            area = self.get(code)
+            if area is None:
+                return frozenset()
+            related = frozenset(
+                {
+                    code,
+                    *(parent.code for parent in self.ancestors(area) if parent.level != "centers"),
+                    *(child.code for child in self.descendants(area)),
+                }
+            )
+            self._related[code] = related
+        return related
+
+
+_INDEX: AreaIndex | None = None
+
+
+def get_area_index() -> AreaIndex:
+    """Return the bundled index, loading it on first use.
+
+    The first call does blocking I/O; use :func:`async_get_area_index` from
+    the event loop.
+    """
+    global _INDEX
+    if _INDEX is None:
+        _INDEX = AreaIndex.from_file()
+        _LOGGER.debug(f"Loaded {len(_INDEX)} JMA areas")
+    return _INDEX
+
+
+async def async_get_area_index(hass: HomeAssistant) -> AreaIndex:
+    """Return the bundled index without blocking the event loop."""
+    if _INDEX is not None:
+        return _INDEX
+    return await hass.async_add_executor_job(get_area_index)
+
+
+def warning_kind(code: str) -> str:
+    """Classify a JMA warning code: 3x special warnings, 0x warnings, else advisories."""
+    if code.isdigit() and int(code) >= 30:
+        return "special_warning"
+    if code.isdigit() and int(code) < 10:
+        return "warning"
+    return "advisory"
+
+
+def area_warnings(reports: Any, codes: frozenset[str]) -> dict[str, list[str]]:
+    """Return the warning codes in force per area, for areas in ``codes``.
+
+    ``reports`` is JMA's national warning map, a list of office reports
+    whose ``areaTypes`` list areas with their warnings.
+    """
+    found: dict[str, list[str]] = {}
+    if not isinstance(reports, list):
+        return found
+    for report in reports:
+        for area_type in report.get("areaTypes", ()):
+            for area in area_type.get("areas", ()):
+                if area.get("code") not in codes:
+                    continue
+                active = [
+                    warning["code"]
+                    for warning in area.get("warnings", ())
+                    if warning.get("code") and warning.get("status") not in INACTIVE_WARNING_STATUSES
+                ]
+                if active:
+                    found[area["code"]] = active
+    return found
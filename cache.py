@@ -0,0 +1,99 @@
+"""Bounded in-memory cache for Bosai Watch payloads."""
+
+from __future__ import annotations
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+
+def estimate_size(value: Any) -> int:
+    """Return an approximate size in bytes of a decoded payload."""
+    size = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set)):
+            stack.extend(item)
+    return size
+
+
+@dataclass
+class CacheEntry:
+    value: Any
+    size: int
+    expires: float
+    stale_until: float
+
+
+class PayloadCache:
+    """LRU cache bounded by entry count and bytes, with per-entry TTLs.
+
+    Entries past their TTL are still served as stale until ``stale_until`` so
+    the caller can revalidate in the background instead of blocking.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[Any, bool] | None:
+        """Return ``(value, is_fresh)`` for ``key`` or ``None`` on a miss."""
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is None or now >= entry.stale_until:
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        if now < entry.expires:
+            self.hits += 1
+            return entry.value, True
+        self.stale_hits += 1
+        return entry.value, False
+
+    def put(self, key: str, value: Any, ttl: float, stale_ttl: float = 0) -> None:
+        """Store ``value`` for ``ttl`` seconds plus ``stale_ttl`` of staleness."""
+        size = estimate_size(value)
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            return
+        now = time.monotonic()
+        self._entries[key] = CacheEntry(value, size, now + ttl, now + ttl + stale_ttl)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def stats(self) -> dict[str, int]:
+        """Return counters suitable for entity attributes."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
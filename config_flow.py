@@ -1,25 +1,32 @@
 import voluptuous as vol
 from homeassistant import config_entries
-from .const import DOMAIN, AREA_CODE
-
-CONF_AREA_CODE = "area_code"
+from .areas import async_get_area_index
+from .const import DOMAIN, AREA_CODE, CONF_AREA_CODE
 
 class BosaiWatchConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Bosai Watch."""
 
-    VERSION = 1
+    # Version 2 scopes the per-area entity ids to the entry
+    VERSION = 2
 
     async def async_step_user(self, user_input=None):
         errors = {}
         if user_input is not None:
-            # Validate area code (simple check)
-            area_code = user_input.get(CONF_AREA_CODE)
-            if not area_code or not area_code.isdigit():
+            # Any center, office or sub-area code in the JMA hierarchy
+            area_code = (user_input.get(CONF_AREA_CODE) or "").strip()
+            area = (await async_get_area_index(self.hass)).get(area_code)
+            if area is None:
                 errors[CONF_AREA_CODE] = "invalid_area_code"
             else:
-                return self.async_create_entry(title="Bosai Watch", data={CONF_AREA_CODE: area_code})
+                # One entry per area; entries share their data fetching
+                await self.async_set_unique_id(area_code)
+                self._abort_if_unique_id_configured()
+                return self.async_create_entry(
+                    title=f"Bosai Watch ({area.en_name or area.name})",
+                    data={CONF_AREA_CODE: area_code},
+                )
 
         data_schema = vol.Schema({
             vol.Required(CONF_AREA_CODE, default=AREA_CODE): str
         })
-        return self.async_show_form(step_id="user", data_schema=data_schema, errors=errors) 
\ No newline at end of file
+        return self.async_show_form(step_id="user", data_schema=data_schema, errors=errors)
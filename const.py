@@ -1,2 +1,41 @@
+from datetime import timedelta
+
 DOMAIN = 'bosai_watch'
-AREA_CODE = '1640024'
+AREA_CODE = '1310100'  # JMA class20 area (municipality) code; Chiyoda, Tokyo
+CONF_AREA_CODE = "area_code"
+# Sensors filtered by the configured area, created for every config entry;
+# all other sensors are nationwide and exist once
+AREA_SENSOR_IDS = frozenset({"japan_seismic_activity", "disaster_alert_level"})
+
+SCAN_INTERVAL = timedelta(seconds=180)  # 3 minutes for comprehensive monitoring
+
+# Shared HTTP connection pool settings
+MAX_CONNECTIONS = 32
+MAX_CONNECTIONS_PER_HOST = 4
+KEEPALIVE_TIMEOUT = 60  # seconds an idle connection stays open
+DNS_CACHE_TTL = 600  # seconds
+
+# Fan-out limits for each hub refresh
+MAX_CONCURRENT_FETCHES = 8
+SOURCE_DEADLINE = 10  # seconds before a single source is given up for the cycle
+
+# Rolling window over which newly seen feed items count towards alert levels
+ALERT_WINDOW = timedelta(hours=1)
+
+# Refresh scheduling
+REFRESH_JITTER = 0.1  # fraction of a source's interval added at random
+COALESCE_WINDOW = 2  # seconds; sources due this close together share a run
+BACKOFF_BASE = 30  # seconds before the first retry of a failing source
+MAX_BACKOFF = 1800  # seconds; cap for sources refreshed more often than this
+
+# Entities start from restored state; first refreshes are spread over this
+STARTUP_STAGGER = 30  # seconds
+
+# Push earthquake feed (P2PQuake WebSocket API) and its history for backfill.
+# Both can be overridden in bosai_watch_secrets.yaml, e.g. to use a stand-in.
+QUAKE_STREAM_URL = "wss://api.p2pquake.net/v2/ws"
+QUAKE_HISTORY_URL = "https://api.p2pquake.net/v2/history?codes=551&limit=20"
+QUAKE_HEARTBEAT = 30  # seconds between WebSocket pings
+QUAKE_RECONNECT_BASE = 1  # seconds before the first reconnection attempt
+QUAKE_RECONNECT_MAX = 300  # seconds; cap for the reconnection backoff
+QUAKE_MAX_EVENTS = 100  # recent events kept in memory
@@ -0,0 +1,263 @@
+"""Shared fetch hub for Bosai Watch data sources."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterable
+from urllib.parse import urlsplit
+
+import aiohttp
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import (
+    BACKOFF_BASE,
+    COALESCE_WINDOW,
+    MAX_BACKOFF,
+    MAX_CONCURRENT_FETCHES,
+    REFRESH_JITTER,
+    SCAN_INTERVAL,
+    SOURCE_DEADLINE,
+    STARTUP_STAGGER,
+)
+from .feeds import is_feed_url, parse_feed
+from .fetch import export_payload, fetch_parsed, restore_payload
+from .response_cache import ResponseCache
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _parse_text(text: str) -> str:
+    return text
+
+
+# Hosts whose API answers JSON at paths without a .json suffix
+JSON_HOSTS = frozenset({"api.open-meteo.com"})
+
+
+def payload_parser(url: str) -> Callable[[str], Any]:
+    """Return the decoder for a source URL."""
+    parts = urlsplit(url)
+    if parts.path.endswith(".json") or parts.hostname in JSON_HOSTS:
+        return json.loads
+    if is_feed_url(url):
+        return parse_feed
+    return _parse_text
+
+
+class BosaiDataHub:
+    """Fetch each distinct source URL on its own schedule and share the result.
+
+    Entities subscribe with the URLs they read and how often each should be
+    refreshed; a URL read by several entities uses the shortest interval and
+    is still fetched once per run. A single timer wakes when the next source
+    is due and fetches, concurrently, every source due within
+    ``COALESCE_WINDOW``. Only entities reading one of the fetched URLs are then
+    notified and recompute from :meth:`get`.
+
+    Successful fetches are rescheduled one interval later plus random jitter
+    so sources do not stay in lockstep. A source that fails or misses its
+    deadline keeps its last good payload, is listed in :attr:`stale` and is
+    retried with exponential backoff.
+
+    With a ``response_cache``, the last good remote payloads survive a
+    restart: :meth:`async_restore` serves them straight away and schedules
+    their revalidation at random points within ``STARTUP_STAGGER``.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        response_cache: ResponseCache | None = None,
+    ) -> None:
+        self.hass = hass
+        self.session = session
+        self.response_cache = response_cache
+        self.data: dict[str, Any] = {}
+        self._fetched_at: dict[str, float] = {}
+        # URLs whose last refresh failed; ``data`` holds their previous payload
+        self.stale: set[str] = set()
+        self.last_update: datetime | None = None
+        self._listeners: dict[
+            CALLBACK_TYPE, tuple[Callable[[], None], dict[str, timedelta]]
+        ] = {}
+        self._next_due: dict[str, float] = {}
+        self._failures: dict[str, int] = {}
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._running = False
+
+    @callback
+    def async_add_listener(
+        self, update_callback: Callable[[], None], sources: dict[str, timedelta]
+    ) -> CALLBACK_TYPE:
+        """Subscribe to URLs with their refresh intervals.
+
+        Returns a callback to unsubscribe.
+        """
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.pop(remove_listener, None)
+            intervals = self.intervals
+            for url in list(self._next_due):
+                if url not in intervals:
+                    del self._next_due[url]
+            self._async_schedule_next()
+
+        self._listeners[remove_listener] = (update_callback, dict(sources))
+        self._async_schedule_next()
+        return remove_listener
+
+    @property
+    def intervals(self) -> dict[str, timedelta]:
+        """Return the shortest interval requested for each subscribed URL."""
+        intervals: dict[str, timedelta] = {}
+        for _update_callback, sources in self._listeners.values():
+            for url, interval in sources.items():
+                if url not in intervals or interval < intervals[url]:
+                    intervals[url] = interval
+        return intervals
+
+    async def async_restore(self) -> set[str]:
+        """Load payloads saved by a previous run and return their URLs."""
+        if self.response_cache is None:
+            return set()
+        entries = await self.response_cache.async_load()
+        decoded = await self.hass.async_add_executor_job(self._decode_entries, entries)
+        now = time.monotonic()
+        for url, parsed in decoded.items():
+            entry = entries[url]
+            restore_payload(
+                url, payload_parser(url), entry["body"], parsed,
+                entry.get("etag"), entry.get("last_modified"),
+            )
+            self.data[url] = parsed
+            self._fetched_at[url] = entry["fetched_at"]
+            self._next_due[url] = now + random.uniform(0, STARTUP_STAGGER)
+        if decoded:
+            _LOGGER.debug(f"Restored {len(decoded)} cached payloads")
+        return set(decoded)
+
+    @staticmethod
+    def _decode_entries(entries: dict[str, dict[str, Any]]) -> dict[str, Any]:
+        decoded = {}
+        for url, entry in entries.items():
+            try:
+                decoded[url] = payload_parser(url)(entry["body"])
+            except Exception as exc:
+                _LOGGER.debug(f"Dropping cached payload for {url}: {exc}")
+        return decoded
+
+    def _cache_snapshot(self) -> dict[str, dict[str, Any]]:
+        snapshot = {}
+        for url, fetched_at in self._fetched_at.items():
+            entry = export_payload(url, payload_parser(url))
+            if entry is not None:
+                snapshot[url] = {**entry, "fetched_at": fetched_at}
+        return snapshot
+
+    def get(self, url: str, default: Any = None) -> Any:
+        """Return the latest parsed payload for ``url``."""
+        return self.data.get(url, default)
+
+    @callback
+    def _async_schedule_next(self) -> None:
+        """Arm the timer for the next due source."""
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._running:
+            return
+
+        intervals = self.intervals
+        if not intervals:
+            return
+
+        now = time.monotonic()
+        next_due = min(self._next_due.get(url, now) for url in intervals)
+        self._unsub_timer = async_call_later(
+            self.hass, max(0.0, next_due - now), self._async_run_due
+        )
+
+    async def _async_run_due(self, _now: datetime) -> None:
+        self._unsub_timer = None
+        horizon = time.monotonic() + COALESCE_WINDOW
+        due = [
+            url for url in self.intervals
+            if self._next_due.get(url, 0) <= horizon
+        ]
+        await self.async_refresh(due)
+
+    async def async_refresh(self, urls: Iterable[str] | None = None) -> None:
+        """Fetch the given URLs (all subscribed ones by default) now.
+
+        Listeners reading any of them are notified afterwards.
+        """
+        targets = list(set(urls) if urls is not None else self.intervals)
+        self._running = True
+        try:
+            results = await asyncio.gather(*(self._async_fetch(url) for url in targets))
+        finally:
+            self._running = False
+
+        intervals = self.intervals
+        now = time.monotonic()
+        cache_changed = False
+        for url, result in zip(targets, results):
+            interval = intervals.get(url, SCAN_INTERVAL).total_seconds()
+            if result is None:
+                self.stale.add(url)
+                failures = self._failures.get(url, 0) + 1
+                self._failures[url] = failures
+                delay = min(
+                    min(interval, BACKOFF_BASE) * 2 ** (failures - 1),
+                    max(interval, MAX_BACKOFF),
+                )
+            else:
+                self.data[url] = result
+                self.stale.discard(url)
+                if url.startswith(("http://", "https://")):
+                    self._fetched_at[url] = time.time()
+                    cache_changed = True
+                self._failures.pop(url, None)
+                delay = interval * (1 + random.uniform(0, REFRESH_JITTER))
+            self._next_due[url] = now + delay
+        self.last_update = datetime.now()
+        if cache_changed and self.response_cache is not None:
+            self.response_cache.async_delay_save(self._cache_snapshot)
+
+        fetched = set(targets)
+        for update_callback, sources in list(self._listeners.values()):
+            if fetched.intersection(sources):
+                update_callback()
+        self._async_schedule_next()
+
+    async def _async_fetch(self, url: str) -> Any:
+        """Fetch and parse a single URL, returning ``None`` on failure."""
+        try:
+            async with self._semaphore, asyncio.timeout(SOURCE_DEADLINE):
+                _status, parsed = await fetch_parsed(
+                    self.session, url, payload_parser(url)
+                )
+            return parsed
+        except TimeoutError:
+            _LOGGER.warning(f"Timed out fetching {url} after {SOURCE_DEADLINE}s")
+            return None
+        except Exception as exc:
+            _LOGGER.warning(f"Failed to fetch {url}: {exc}")
+            return None
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop the refresh timer and drop all listeners."""
+        self._listeners.clear()
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
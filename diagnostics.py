@@ -0,0 +1,31 @@
+"""Diagnostics for Bosai Watch: cache counters and source health."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_AREA_CODE, DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return the state of the fetch pipeline shared by every entry.
+
+    Counters that change on every poll live here rather than in entity
+    attributes, so they do not add a recorder row per update.
+    """
+    pipeline = hass.data[DOMAIN]["pipeline"]
+    hub = pipeline["hub"]
+    data_source = pipeline.get("data_source")
+    return {
+        "area_code": entry.data.get(CONF_AREA_CODE),
+        "entries": len(pipeline["entries"]),
+        "hub": {
+            "sources": len(hub.intervals),
+            "stale_sources": sorted(hub.stale),
+            "last_update": hub.last_update.isoformat() if hub.last_update else None,
+        },
+        "payload_cache": data_source.cache.stats() if data_source is not None else None,
+    }
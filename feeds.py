@@ -0,0 +1,59 @@
+"""RSS/Atom parsing for Bosai Watch news feeds."""
+
+from __future__ import annotations
+
+from typing import NamedTuple
+from xml.etree import ElementTree
+
+# Element names (without namespace) that delimit a feed entry
+ITEM_TAGS = {"item", "entry"}
+
+
+class FeedItem(NamedTuple):
+    """A single RSS item or Atom entry."""
+
+    guid: str
+    title: str
+    summary: str
+    link: str
+    published: str
+
+    @property
+    def text(self) -> str:
+        """Return the human readable text used for keyword scanning."""
+        return f"{self.title}\n{self.summary}"
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _to_item(elem: ElementTree.Element) -> FeedItem:
+    fields: dict[str, str] = {}
+    for child in elem:
+        name = _local_name(child.tag)
+        if name == "link" and child.get("href"):
+            fields.setdefault("link", child.get("href"))
+        else:
+            fields.setdefault(name, "".join(child.itertext()).strip())
+    link = fields.get("link", "")
+    title = fields.get("title", "")
+    summary = fields.get("description") or fields.get("summary") or fields.get("content", "")
+    guid = fields.get("guid") or fields.get("id") or link or title
+    published = fields.get("pubDate") or fields.get("published") or fields.get("updated") or fields.get("date", "")
+    return FeedItem(guid, title, summary, link, published)
+
+
+def parse_feed(text: str) -> tuple[FeedItem, ...]:
+    """Parse a complete RSS 1.0/2.0 or Atom document into its items.
+
+    The fetch layer reads bodies whole (they are kept for conditional
+    requests and the response cache), so the document is parsed in one pass.
+    """
+    root = ElementTree.fromstring(text)
+    return tuple(_to_item(elem) for elem in root.iter() if _local_name(elem.tag) in ITEM_TAGS)
+
+
+def is_feed_url(url: str) -> bool:
+    """Return True if ``url`` points at an RSS or Atom feed."""
+    return url.endswith((".xml", ".rss", ".rdf")) or "/rss" in url
@@ -0,0 +1,130 @@
+"""Low level fetch helpers shared by the Bosai Watch data sources.
+
+An unchanged resource (an untouched local file or an HTTP 304 answer to a
+conditional request) is returned as the very same string object as the
+previous call, which lets :func:`fetch_parsed` skip decoding it again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+import aiohttp
+from aiohttp import hdrs
+
+_LOGGER = logging.getLogger(__name__)
+
+# Decoded local files keyed by path, with the (mtime, size) they were read at
+_FILE_CACHE: dict[str, tuple[tuple[int, int], str]] = {}
+
+# HTTP validators per URL: (ETag, Last-Modified, body they describe)
+_VALIDATORS: dict[str, tuple[str | None, str | None, str]] = {}
+
+# Last raw payload and its decoded form per (URL, parser)
+_PARSED: dict[tuple[str, Callable[[str], Any]], tuple[str, Any]] = {}
+
+
+def _read_local_file(path: str) -> str:
+    """Return the text of ``path``, re-reading only when it changed on disk.
+
+    This does blocking I/O and must run in an executor.
+    """
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _FILE_CACHE.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    text = Path(path).read_text(encoding="utf-8")
+    _FILE_CACHE[path] = (signature, text)
+    return text
+
+
+async def async_read_local_file(path: str) -> str:
+    """Read a local file without blocking the event loop."""
+    return await asyncio.get_running_loop().run_in_executor(None, _read_local_file, path)
+
+
+async def get_content(session: aiohttp.ClientSession, url: str) -> tuple[int, str]:
+    """Fetch content from a URL or local file.
+
+    Remote requests are conditional once the server has supplied an ETag or
+    Last-Modified header; a 304 answer is reported as 200 with the cached body.
+    """
+    if url.startswith("file://"):
+        path = url[7:]
+        try:
+            return 200, await async_read_local_file(path)
+        except Exception as exc:
+            _LOGGER.error(f"Error reading {path}: {exc}")
+            return 500, ""
+
+    headers = {}
+    cached = _VALIDATORS.get(url)
+    if cached is not None:
+        etag, last_modified, _body = cached
+        if etag:
+            headers[hdrs.IF_NONE_MATCH] = etag
+        if last_modified:
+            headers[hdrs.IF_MODIFIED_SINCE] = last_modified
+
+    async with session.get(url, timeout=10, headers=headers) as response:
+        if response.status == 304 and cached is not None:
+            return 200, cached[2]
+        text = await response.text()
+        if response.status == 200:
+            etag = response.headers.get(hdrs.ETAG)
+            last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+            if etag or last_modified:
+                _VALIDATORS[url] = (etag, last_modified, text)
+            else:
+                _VALIDATORS.pop(url, None)
+        return response.status, text
+
+
+async def fetch_parsed(
+    session: aiohttp.ClientSession, url: str, parser: Callable[[str], Any]
+) -> tuple[int, Any]:
+    """Fetch ``url`` and decode it with ``parser``, reusing unchanged results."""
+    status, text = await get_content(session, url)
+    if status != 200:
+        return status, None
+    key = (url, parser)
+    previous = _PARSED.get(key)
+    if previous is not None and previous[0] is text:
+        return status, previous[1]
+    parsed = parser(text)
+    _PARSED[key] = (text, parsed)
+    return status, parsed
+
+
+def export_payload(url: str, parser: Callable[[str], Any]) -> dict[str, Any] | None:
+    """Return the last decoded body of ``url`` with its HTTP validators."""
+    previous = _PARSED.get((url, parser))
+    if previous is None:
+        return None
+    etag, last_modified, body = _VALIDATORS.get(url, (None, None, None))
+    if body is not previous[0]:
+        etag = last_modified = None
+    return {"body": previous[0], "etag": etag, "last_modified": last_modified}
+
+
+def restore_payload(
+    url: str,
+    parser: Callable[[str], Any],
+    body: str,
+    parsed: Any,
+    etag: str | None = None,
+    last_modified: str | None = None,
+) -> None:
+    """Seed the caches with a payload saved by a previous run.
+
+    The next request for ``url`` is then conditional, and a 304 answer hands
+    back ``parsed`` without decoding the body again.
+    """
+    _PARSED[(url, parser)] = (body, parsed)
+    if etag or last_modified:
+        _VALIDATORS[url] = (etag, last_modified, body)
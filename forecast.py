@@ -0,0 +1,119 @@
+"""Vectorised analysis of Open-Meteo hourly forecasts."""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+import numpy as np
+
+# Hourly precipitation (mm/h) above which an hour counts as heavy rain
+MODERATE_RAIN = 20
+SEVERE_RAIN = 50
+
+# Accumulation thresholds (mm) over rolling windows, in hours
+ACCUMULATION_THRESHOLDS = {
+    3: {"moderate": 50, "severe": 100},
+    24: {"moderate": 100, "severe": 200},
+}
+
+# Temperatures (°C) treated as heat emergencies (JMA 猛暑日 and above)
+MODERATE_HEAT = 35
+SEVERE_HEAT = 40
+
+# WMO weather_code to severity: 0 none, 1 minor, 2 moderate, 3 severe
+_CODE_SEVERITY = np.zeros(100, dtype=np.int8)
+_CODE_SEVERITY[[45, 48, 51, 53, 55, 56, 57, 61, 63, 71, 73, 77, 80, 81, 85]] = 1
+_CODE_SEVERITY[[65, 66, 67, 75, 82, 86, 95]] = 2
+_CODE_SEVERITY[[96, 99]] = 3
+
+LEVELS = ("normal", "moderate", "severe")
+
+
+class ForecastAnalysis(NamedTuple):
+    """Emergency level and summary figures for an hourly forecast."""
+
+    level: str
+    forecast_hours: int
+    max_precipitation: float
+    max_precipitation_3h: float
+    max_precipitation_24h: float
+    heavy_rain_hours: int
+    longest_heavy_rain_hours: int
+    temperature_max: float | None
+    temperature_min: float | None
+    max_weather_severity: int
+    emergency_factors: list[str]
+
+
+def _column(hourly: dict[str, Any], name: str) -> np.ndarray:
+    """Return a float column, with missing values as NaN."""
+    return np.asarray(hourly.get(name) or [], dtype=float)
+
+
+def _rolling_max(values: np.ndarray, window: int) -> float:
+    """Largest sum over ``window`` consecutive hours (the total if shorter)."""
+    if not values.size:
+        return 0.0
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    if values.size <= window:
+        return float(cumulative[-1])
+    return float(np.max(cumulative[window:] - cumulative[:-window]))
+
+
+def _longest_run(mask: np.ndarray) -> int:
+    """Length of the longest run of True values."""
+    if not mask.any():
+        return 0
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    return int(np.max(ends - starts))
+
+
+def analyze_hourly(hourly: dict[str, Any]) -> ForecastAnalysis:
+    """Classify every hour of an Open-Meteo ``hourly`` block at once."""
+    precipitation = np.nan_to_num(_column(hourly, "precipitation"))
+    temperature = _column(hourly, "temperature_2m")
+    codes = _column(hourly, "weather_code")
+    codes = codes[~np.isnan(codes)].astype(np.int64).clip(0, 99)
+
+    max_hourly = float(precipitation.max()) if precipitation.size else 0.0
+    accumulations = {
+        window: _rolling_max(precipitation, window) for window in ACCUMULATION_THRESHOLDS
+    }
+    heavy = precipitation > MODERATE_RAIN
+    valid_temperature = temperature[~np.isnan(temperature)]
+    temperature_max = float(valid_temperature.max()) if valid_temperature.size else None
+    temperature_min = float(valid_temperature.min()) if valid_temperature.size else None
+    severity = int(_CODE_SEVERITY[codes].max()) if codes.size else 0
+
+    # Each factor raises the level to 1 (moderate) or 2 (severe)
+    factors: dict[str, int] = {}
+    if max_hourly > SEVERE_RAIN:
+        factors["hourly_rain"] = 2
+    elif max_hourly > MODERATE_RAIN:
+        factors["hourly_rain"] = 1
+    for window, thresholds in ACCUMULATION_THRESHOLDS.items():
+        if accumulations[window] > thresholds["severe"]:
+            factors[f"rain_{window}h"] = 2
+        elif accumulations[window] > thresholds["moderate"]:
+            factors[f"rain_{window}h"] = 1
+    if temperature_max is not None and temperature_max >= SEVERE_HEAT:
+        factors["heat"] = 2
+    elif temperature_max is not None and temperature_max >= MODERATE_HEAT:
+        factors["heat"] = 1
+    if severity >= 2:
+        factors["weather_code"] = severity - 1
+
+    return ForecastAnalysis(
+        level=LEVELS[max(factors.values(), default=0)],
+        forecast_hours=int(max(precipitation.size, temperature.size, codes.size)),
+        max_precipitation=round(max_hourly, 1),
+        max_precipitation_3h=round(accumulations[3], 1),
+        max_precipitation_24h=round(accumulations[24], 1),
+        heavy_rain_hours=int(heavy.sum()),
+        longest_heavy_rain_hours=_longest_run(heavy),
+        temperature_max=temperature_max,
+        temperature_min=temperature_min,
+        max_weather_severity=severity,
+        emergency_factors=sorted(factors),
+    )
@@ -0,0 +1,240 @@
+"""Compact on-disk history of Bosai Watch sensor readings.
+
+Each numeric series is stored as one segment per UTC day made of two
+append-only column files: ``<day>-raw.t`` holds uint32 milliseconds since
+the start of the day and ``<day>-raw.v`` the float32 values, 8 bytes per
+sample. Segments older than ``RAW_RETENTION`` are downsampled to
+``DOWNSAMPLE_BUCKET`` averages (``<day>-5m.*``) and dropped after
+``RETENTION``. Reads memory-map the columns and binary search the time
+column, so a week of data is sliced without parsing anything.
+"""
+
+from __future__ import annotations
+
+import bisect
+import calendar
+import logging
+import mmap
+import os
+import time
+from array import array
+from collections import deque
+from datetime import timedelta
+from pathlib import Path
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+HISTORY_DIR = "bosai_watch_history"
+RETENTION = timedelta(days=30)
+RAW_RETENTION = timedelta(days=2)
+DOWNSAMPLE_BUCKET = 300  # seconds
+FLUSH_INTERVAL = timedelta(minutes=1)
+TREND_WINDOW = 3600  # seconds of recent samples kept in memory for trends
+TREND_THRESHOLD = 0.05  # relative change over the window reported as a trend
+
+_TIME_TYPE = "I"  # uint32 milliseconds since the start of the UTC day
+_VALUE_TYPE = "f"  # float32
+_RAW = "raw"
+_DOWNSAMPLED = "5m"
+
+
+def _day_key(timestamp: float) -> str:
+    return time.strftime("%Y%m%d", time.gmtime(timestamp))
+
+
+def _day_start(day: str) -> int:
+    return calendar.timegm(time.strptime(day, "%Y%m%d"))
+
+
+def _read_slice(path: Path, start_ms: int, end_ms: int) -> tuple[array, array]:
+    """Return the samples of one segment between two day offsets."""
+    offsets, values = array(_TIME_TYPE), array(_VALUE_TYPE)
+    time_path, value_path = path.with_suffix(".t"), path.with_suffix(".v")
+    if not time_path.exists() or not value_path.exists():
+        return offsets, values
+    with time_path.open("rb") as time_file, value_path.open("rb") as value_file:
+        size = min(os.fstat(time_file.fileno()).st_size // 4, os.fstat(value_file.fileno()).st_size // 4)
+        if not size:
+            return offsets, values
+        with mmap.mmap(time_file.fileno(), 0, access=mmap.ACCESS_READ) as time_map, \
+                mmap.mmap(value_file.fileno(), 0, access=mmap.ACCESS_READ) as value_map:
+            time_view = memoryview(time_map)[:size * 4].cast(_TIME_TYPE)
+            value_view = memoryview(value_map)[:size * 4].cast(_VALUE_TYPE)
+            try:
+                low = bisect.bisect_left(time_view, start_ms)
+                high = bisect.bisect_right(time_view, end_ms)
+                offsets.frombytes(time_view[low:high].tobytes())
+                values.frombytes(value_view[low:high].tobytes())
+            finally:
+                time_view.release()
+                value_view.release()
+    return offsets, values
+
+
+def _append_columns(path: Path, offsets: array, values: array) -> None:
+    with path.with_suffix(".t").open("ab") as time_file:
+        offsets.tofile(time_file)
+    with path.with_suffix(".v").open("ab") as value_file:
+        values.tofile(value_file)
+
+
+def _slope(samples: deque) -> float:
+    """Least squares slope of ``(timestamp, value)`` samples per second."""
+    count = len(samples)
+    mean_t = sum(t for t, _ in samples) / count
+    mean_v = sum(v for _, v in samples) / count
+    var_t = sum((t - mean_t) ** 2 for t, _ in samples)
+    if not var_t:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in samples) / var_t
+
+
+class HistoryStore:
+    """Append-only per-sensor numeric history under the HA config directory.
+
+    :meth:`record` only buffers in memory and is safe on the event loop;
+    file access happens in :meth:`async_flush` and :meth:`async_query`,
+    which run in the executor. :meth:`async_restore_recent` reads the trend
+    window back after a restart, so trends carry on where they left off.
+    """
+
+    def __init__(self, hass: HomeAssistant, base_dir: Path) -> None:
+        self.hass = hass
+        self.base_dir = base_dir
+        self._pending: dict[str, tuple[array, array]] = {}
+        self._recent: dict[str, deque[tuple[float, float]]] = {}
+        self._maintained_day: str | None = None
+
+    def record(self, series: str, value: float, timestamp: float | None = None) -> None:
+        """Buffer a sample for ``series``."""
+        timestamp = time.time() if timestamp is None else timestamp
+        times, values = self._pending.setdefault(series, (array("d"), array(_VALUE_TYPE)))
+        times.append(timestamp)
+        values.append(value)
+
+        recent = self._recent.setdefault(series, deque())
+        recent.append((timestamp, float(value)))
+        while recent[0][0] < timestamp - TREND_WINDOW:
+            recent.popleft()
+
+    def trend(self, series: str) -> str:
+        """Return ``rising``, ``falling`` or ``stable`` over the trend window."""
+        recent = self._recent.get(series)
+        if not recent or len(recent) < 3:
+            return "stable"
+        span = recent[-1][0] - recent[0][0]
+        scale = max(abs(sum(v for _, v in recent) / len(recent)), 1e-9)
+        change = _slope(recent) * span / scale
+        if change > TREND_THRESHOLD:
+            return "rising"
+        if change < -TREND_THRESHOLD:
+            return "falling"
+        return "stable"
+
+    async def async_restore_recent(self) -> None:
+        """Load the last ``TREND_WINDOW`` of every stored series for :meth:`trend`."""
+        now = time.time()
+        for series in await self.hass.async_add_executor_job(self._series_names):
+            times, values = await self.async_query(series, now - TREND_WINDOW, now)
+            recent = self._recent.setdefault(series, deque())
+            first = recent[0][0] if recent else now
+            recent.extendleft(
+                reversed([(t, float(v)) for t, v in sorted(zip(times, values)) if t < first])
+            )
+
+    def _series_names(self) -> list[str]:
+        if not self.base_dir.is_dir():
+            return []
+        return [path.name for path in self.base_dir.iterdir() if path.is_dir()]
+
+    async def async_flush(self) -> None:
+        """Write buffered samples to disk."""
+        pending, self._pending = self._pending, {}
+        if pending:
+            await self.hass.async_add_executor_job(self._write, pending)
+
+    def _write(self, pending: dict[str, tuple[array, array]]) -> None:
+        for series, (times, values) in pending.items():
+            series_dir = self.base_dir / series
+            series_dir.mkdir(parents=True, exist_ok=True)
+            by_day: dict[str, tuple[array, array]] = {}
+            for timestamp, value in zip(times, values):
+                day = _day_key(timestamp)
+                offsets, day_values = by_day.setdefault(day, (array(_TIME_TYPE), array(_VALUE_TYPE)))
+                offsets.append(int((timestamp - _day_start(day)) * 1000))
+                day_values.append(value)
+            for day, (offsets, day_values) in by_day.items():
+                _append_columns(series_dir / f"{day}-{_RAW}", offsets, day_values)
+
+        today = _day_key(time.time())
+        if self._maintained_day != today:
+            self._maintained_day = today
+            self._maintain()
+
+    def _maintain(self) -> None:
+        """Downsample old raw segments and drop expired ones."""
+        now = time.time()
+        expire_before = _day_key(now - RETENTION.total_seconds())
+        downsample_before = _day_key(now - RAW_RETENTION.total_seconds())
+        if not self.base_dir.is_dir():
+            return
+        for series_dir in self.base_dir.iterdir():
+            for time_path in sorted(series_dir.glob("*.t")):
+                day, resolution = time_path.stem.split("-", 1)
+                segment = time_path.with_suffix("")
+                if day < expire_before:
+                    time_path.unlink(missing_ok=True)
+                    segment.with_suffix(".v").unlink(missing_ok=True)
+                elif resolution == _RAW and day < downsample_before:
+                    self._downsample(series_dir, day)
+
+    def _downsample(self, series_dir: Path, day: str) -> None:
+        raw = series_dir / f"{day}-{_RAW}"
+        offsets, values = _read_slice(raw, 0, 2**32 - 1)
+        bucket_ms = DOWNSAMPLE_BUCKET * 1000
+        sums: dict[int, list[float]] = {}
+        for offset, value in zip(offsets, values):
+            bucket = sums.setdefault(offset // bucket_ms, [0.0, 0])
+            bucket[0] += value
+            bucket[1] += 1
+        down_offsets = array(_TIME_TYPE, (bucket * bucket_ms + bucket_ms // 2 for bucket in sorted(sums)))
+        down_values = array(_VALUE_TYPE, (sums[bucket][0] / sums[bucket][1] for bucket in sorted(sums)))
+
+        target = series_dir / f"{day}-{_DOWNSAMPLED}"
+        tmp = series_dir / f"{day}-tmp"
+        _append_columns(tmp, down_offsets, down_values)
+        os.replace(tmp.with_suffix(".t"), target.with_suffix(".t"))
+        os.replace(tmp.with_suffix(".v"), target.with_suffix(".v"))
+        raw.with_suffix(".t").unlink(missing_ok=True)
+        raw.with_suffix(".v").unlink(missing_ok=True)
+        _LOGGER.debug(f"Downsampled {series_dir.name} {day}: {len(offsets)} -> {len(down_offsets)} samples")
+
+    async def async_query(
+        self, series: str, start: float, end: float
+    ) -> tuple[array, array]:
+        """Return ``(timestamps, values)`` of ``series`` between two epochs."""
+        times, values = await self.hass.async_add_executor_job(self._query, series, start, end)
+        pending = self._pending.get(series)
+        if pending:
+            for timestamp, value in zip(*pending):
+                if start <= timestamp <= end:
+                    times.append(timestamp)
+                    values.append(value)
+        return times, values
+
+    def _query(self, series: str, start: float, end: float) -> tuple[array, array]:
+        times, values = array("d"), array(_VALUE_TYPE)
+        series_dir = self.base_dir / series
+        day_start = _day_start(_day_key(start))
+        while day_start <= end:
+            day = _day_key(day_start)
+            start_ms = max(0, int((start - day_start) * 1000))
+            end_ms = min(2**32 - 1, int((end - day_start) * 1000))
+            for resolution in (_DOWNSAMPLED, _RAW):
+                offsets, day_values = _read_slice(series_dir / f"{day}-{resolution}", start_ms, end_ms)
+                times.extend(day_start + offset / 1000 for offset in offsets)
+                values.extend(day_values)
+            day_start += 86400
+        return times, values
@@ -0,0 +1,125 @@
+"""Per-source index of seen feed items with rolling keyword counts."""
+
+from __future__ import annotations
+
+import hashlib
+import time
+from collections import Counter, deque
+from typing import Any, Sequence
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .keywords import KeywordMatcher
+
+STORAGE_VERSION = 1
+SAVE_DELAY = 30  # seconds
+
+
+def item_key(item) -> str:
+    """Return a compact stable key for a feed item."""
+    basis = item.guid or f"{item.title}\n{item.summary}"
+    return hashlib.blake2b(basis.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class _SourceIndex:
+    """Seen keys and windowed keyword counts for one source."""
+
+    def __init__(self) -> None:
+        self.seen: dict[str, float] = {}
+        self.events: deque[tuple[float, Counter]] = deque()
+        self.totals: Counter = Counter()
+        self.last_items: Sequence | None = None
+
+
+class SeenItemIndex:
+    """Track which feed items were already counted, per source.
+
+    Each cycle only items not seen before are scanned for keywords. Their
+    category counts enter a rolling window and leave it again once older than
+    ``window`` seconds, so alert levels follow what is new rather than how long
+    the feed is. The index is persisted so a restart does not recount a feed.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        storage_key: str,
+        matcher: KeywordMatcher,
+        window: float,
+    ) -> None:
+        self.matcher = matcher
+        self.window = window
+        self._sources: dict[str, _SourceIndex] = {}
+        self._store: Store = Store(hass, STORAGE_VERSION, storage_key)
+
+    async def async_load(self) -> None:
+        """Restore the index saved by a previous run."""
+        stored = await self._store.async_load() or {}
+        for source, data in stored.items():
+            index = self._sources.setdefault(source, _SourceIndex())
+            index.seen.update(data.get("seen", {}))
+            for timestamp, counts in data.get("events", []):
+                counter = Counter(counts)
+                index.events.append((timestamp, counter))
+                index.totals.update(counter)
+        now = time.time()
+        for index in self._sources.values():
+            self._expire(index, now)
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            source: {
+                "seen": index.seen,
+                "events": [[timestamp, dict(counts)] for timestamp, counts in index.events],
+            }
+            for source, index in self._sources.items()
+        }
+
+    def update(self, source: str, items: Sequence, now: float | None = None) -> int:
+        """Record ``items`` for ``source`` and return how many were new.
+
+        Passing the same parsed sequence again (another subscriber in the same
+        cycle, or an unchanged feed) does no work.
+        """
+        index = self._sources.setdefault(source, _SourceIndex())
+        if index.last_items is items:
+            return 0
+        index.last_items = items
+        now = time.time() if now is None else now
+
+        new_items = []
+        present = set()
+        for item in items:
+            key = item_key(item)
+            present.add(key)
+            if key not in index.seen:
+                new_items.append(item)
+            index.seen[key] = now
+
+        if new_items:
+            counts = self.matcher.scan(item.text for item in new_items).categories
+            if counts:
+                index.events.append((now, counts))
+                index.totals.update(counts)
+
+        cutoff = now - self.window
+        for key in [key for key, seen_at in index.seen.items() if seen_at < cutoff and key not in present]:
+            del index.seen[key]
+        self._expire(index, now)
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return len(new_items)
+
+    def window_counts(self, source: str, now: float | None = None) -> Counter:
+        """Return category counts of items first seen within the window."""
+        index = self._sources.get(source)
+        if index is None:
+            return Counter()
+        self._expire(index, time.time() if now is None else now)
+        return +index.totals
+
+    def _expire(self, index: _SourceIndex, now: float) -> None:
+        cutoff = now - self.window
+        while index.events and index.events[0][0] < cutoff:
+            _timestamp, counts = index.events.popleft()
+            index.totals.subtract(counts)
@@ -3,38 +3,114 @@ import aiohttp
 import json
 from pathlib import Path
 
+from .fetch import fetch_parsed
+
 
 DATA_DIR = Path(__file__).resolve().parent / "data"
 OPEN_METEO_URL = f"file://{DATA_DIR / 'weather_sample.json'}"
+# Live endpoint; latitude and longitude take comma-separated lists
+OPEN_METEO_API_URL = (
+    "https://api.open-meteo.com/v1/jma?latitude={lat}&longitude={lon}"
+    "&hourly=temperature_2m,weather_code,precipitation&timezone=Asia%2FTokyo"
+)
+
+
+def _location_forecast(latitude: float, longitude: float, payload: dict) -> dict | None:
+    hourly = payload.get("hourly", {})
+    temps = hourly.get("temperature_2m", [])
+    codes = hourly.get("weather_code", [])
+    if not temps or not codes:
+        return None
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "temperature": float(temps[0]),
+        "condition": codes[0],
+        "hourly": hourly,
+    }
+
+
+def forecasts_url(
+    locations: dict[str, tuple[float, float]], url_template: str = OPEN_METEO_API_URL
+) -> str:
+    """Return the URL of one request covering every site in ``locations``."""
+    return url_template.format(
+        lat=",".join(str(latitude) for latitude, _longitude in locations.values()),
+        lon=",".join(str(longitude) for _latitude, longitude in locations.values()),
+    )
+
+
+def split_forecasts(
+    locations: dict[str, tuple[float, float]], data
+) -> dict[str, dict | None] | None:
+    """Split a decoded multi-site answer into one forecast per named site.
 
+    Open-Meteo answers with one forecast per location, in order, and with a
+    plain object for a single location. A single forecast for several sites
+    (the offline sample, which ignores coordinates) applies to all of them.
+    Returns None if the answer does not match the sites.
+    """
+    if not locations:
+        return {}
+    payloads = data if isinstance(data, list) else [data]
+    if len(payloads) == 1:
+        payloads = payloads * len(locations)
+    if len(payloads) != len(locations) or not all(isinstance(payload, dict) for payload in payloads):
+        return None
+    return {
+        name: _location_forecast(*locations[name], payload)
+        for name, payload in zip(locations, payloads)
+    }
+
+
+async def fetch_jma_forecasts(
+    locations: dict[str, tuple[float, float]],
+    session: aiohttp.ClientSession | None = None,
+    url_template: str = OPEN_METEO_API_URL,
+) -> dict[str, dict | None] | None:
+    """Fetch forecasts for several named ``(latitude, longitude)`` sites at once.
+
+    All coordinates go into a single request. Each site maps to its current
+    temperature and condition plus the full ``hourly`` block, or to None if
+    its forecast was incomplete. Returns None if the request failed.
+    """
+    if not locations:
+        return {}
+    url = forecasts_url(locations, url_template)
+    try:
+        if session is None:
+            async with aiohttp.ClientSession() as own_session:
+                status, data = await fetch_parsed(own_session, url, json.loads)
+        else:
+            status, data = await fetch_parsed(session, url, json.loads)
+    except Exception:
+        return None
+    if status != 200:
+        return None
+    return split_forecasts(locations, data)
 
-async def fetch_jma_weather(latitude: float = 35.68, longitude: float = 139.76) -> dict | None:
-    """Fetch a minimal weather forecast from the Open-Meteo JMA model."""
-    url = OPEN_METEO_URL
-    if url.startswith("file://"):
-        try:
-            data = json.loads(Path(url[7:]).read_text(encoding="utf-8"))
-        except Exception:
-            return None
-    else:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url.format(lat=latitude, lon=longitude)) as resp:
-                if resp.status != 200:
-                    return None
-                try:
-                    data = await resp.json()
-                except Exception:
-                    return None
-
-    temps = data.get("hourly", {}).get("temperature_2m", [])
-    codes = data.get("hourly", {}).get("weather_code", [])
-    if temps and codes:
-        return {
-            "temperature": float(temps[0]),
-            "condition": codes[0],
-        }
-
-    return None
+
+async def fetch_jma_weather(
+    latitude: float = 35.68,
+    longitude: float = 139.76,
+    session: aiohttp.ClientSession | None = None,
+    url_template: str = OPEN_METEO_URL,
+) -> dict | None:
+    """Fetch a minimal weather forecast from the Open-Meteo JMA model.
+
+    Reads the bundled offline sample unless ``url_template`` is given, e.g.
+    OPEN_METEO_API_URL for live forecasts. Pass the integration's shared
+    ``session`` to reuse its connection pool and conditional request
+    validators.
+    """
+    forecasts = await fetch_jma_forecasts({"site": (latitude, longitude)}, session, url_template)
+    forecast = forecasts and forecasts["site"]
+    if not forecast:
+        return None
+    return {
+        "temperature": forecast["temperature"],
+        "condition": forecast["condition"],
+    }
 
 def get_mock_jma_data():
     # Simulate fetching data from JMA
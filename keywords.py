@@ -0,0 +1,113 @@
+"""Single-pass hazard keyword matching for Japanese feed text."""
+
+from __future__ import annotations
+
+from collections import Counter, OrderedDict, deque
+from typing import Iterable, NamedTuple, Sequence
+
+# Hazard vocabulary by category. A keyword may appear in several categories.
+KEYWORD_CATEGORIES: dict[str, list[str]] = {
+    "disaster": ['地震', '津波', '台風', '洪水', '警報', '避難'],
+    "government": ['対策', '対応', '緊急', '災害'],
+    "infrastructure": ['停電', '断水', 'ガス', '通信障害'],
+}
+
+# Number of recent item sequences whose scan results are kept
+_SCAN_CACHE_SIZE = 16
+
+
+class KeywordScan(NamedTuple):
+    """Keyword and category hit counts for a scanned text."""
+
+    keywords: Counter
+    categories: Counter
+
+
+class KeywordMatcher:
+    """Aho–Corasick automaton over a categorised keyword dictionary.
+
+    The automaton is built once; scanning is a single pass over the text
+    whatever the number of keywords, and yields per-keyword and per-category
+    counts together.
+    """
+
+    def __init__(self, categories: dict[str, Sequence[str]]) -> None:
+        self._categories: dict[str, list[str]] = {}
+        for category, words in categories.items():
+            for word in words:
+                self._categories.setdefault(word, []).append(category)
+
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[str, ...]] = [()]
+        for word in self._categories:
+            self._add(word)
+        self._build_failure_links()
+        self._scan_cache: OrderedDict[int, tuple[Sequence, KeywordScan]] = OrderedDict()
+
+    def _add(self, word: str) -> None:
+        state = 0
+        for char in word:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] += (word,)
+
+    def _build_failure_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._out[next_state] += self._out[self._fail[next_state]]
+
+    def scan(self, texts: Iterable[str]) -> KeywordScan:
+        """Count keyword occurrences across ``texts`` in one pass each.
+
+        Matching restarts for every text, so no match spans two texts.
+        """
+        goto, fail, out = self._goto, self._fail, self._out
+        keywords: Counter = Counter()
+        for text in texts:
+            state = 0
+            for char in text:
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                if out[state]:
+                    keywords.update(out[state])
+
+        categories: Counter = Counter()
+        for word, count in keywords.items():
+            for category in self._categories[word]:
+                categories[category] += count
+        return KeywordScan(keywords, categories)
+
+    def scan_items(self, items: Sequence) -> KeywordScan:
+        """Scan feed items, reusing the result for an identical item sequence.
+
+        The hub hands every subscriber the same parsed sequence, so sensors
+        reading one feed share a single scan per cycle.
+        """
+        key = id(items)
+        cached = self._scan_cache.get(key)
+        if cached is not None and cached[0] is items:
+            self._scan_cache.move_to_end(key)
+            return cached[1]
+        result = self.scan(item.text for item in items)
+        self._scan_cache[key] = (items, result)
+        if len(self._scan_cache) > _SCAN_CACHE_SIZE:
+            self._scan_cache.popitem(last=False)
+        return result
+
+
+HAZARD_MATCHER = KeywordMatcher(KEYWORD_CATEGORIES)
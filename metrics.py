@@ -0,0 +1,198 @@
+"""Derived metrics computed from other Bosai Watch sensors."""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Callable, Iterable
+
+# A compute function receives its inputs by name and returns
+# ``(value, attributes)``, or ``None`` if it cannot produce a value.
+ComputeFunc = Callable[[dict[str, Any]], "tuple[Any, dict[str, Any]] | None"]
+
+SAFETY_WEIGHTS = {
+    "seismic_activity": 0.25,
+    "weather_conditions": 0.20,
+    "infrastructure_health": 0.25,
+    "emergency_readiness": 0.15,
+    "government_response": 0.15,
+}
+
+# 0-100 safety scores (higher = safer) for string sensor states
+WEATHER_SAFETY = {"normal": 95, "moderate": 70, "severe": 40}
+RESPONSE_SAFETY = {"routine": 95, "active": 88, "elevated": 70, "maximum": 50}
+
+
+def _number(value: Any) -> float | None:
+    """Return ``value`` as a float, or None for "Unknown", "Error" and the like."""
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+class MetricGraph:
+    """Dependency graph of derived metrics over published sensor values.
+
+    Sensors publish their latest value under their id. A derived metric is
+    recomputed only when one of its inputs changes, and only once all of its
+    inputs have been published; a change in its own value propagates to the
+    metrics and listeners that depend on it.
+    """
+
+    def __init__(self) -> None:
+        self._values: dict[str, Any] = {}
+        self._results: dict[str, tuple[Any, dict[str, Any]]] = {}
+        self._derived: dict[str, tuple[tuple[str, ...], ComputeFunc]] = {}
+        self._dependents: dict[str, list[str]] = {}
+        self._listeners: dict[str, list[Callable[[], None]]] = {}
+
+    def add_derived(self, name: str, inputs: Iterable[str], compute: ComputeFunc) -> None:
+        """Register a derived metric computed from ``inputs``.
+
+        Derived inputs must be registered first, which keeps registration
+        order a valid evaluation order.
+        """
+        inputs = tuple(inputs)
+        if name in inputs or name in self._dependents or name in self._derived:
+            raise ValueError(f"Metric {name} must be registered once, before metrics using it")
+        self._derived[name] = (inputs, compute)
+        for input_name in inputs:
+            self._dependents.setdefault(input_name, []).append(name)
+
+    def is_derived(self, name: str) -> bool:
+        return name in self._derived
+
+    def get(self, name: str) -> tuple[Any, dict[str, Any]] | None:
+        """Return ``(value, attributes)`` of a derived metric."""
+        return self._results.get(name)
+
+    def publish(self, name: str, value: Any) -> None:
+        """Record a sensor value and update the metrics depending on it.
+
+        Each affected metric is recomputed at most once, in dependency order.
+        """
+        if self.is_derived(name):
+            return
+        if name in self._values and self._values[name] == value:
+            return
+        self._values[name] = value
+
+        dirty = set(self._dependents.get(name, []))
+        for metric in self._derived:
+            if metric in dirty and self._recompute(metric):
+                dirty.update(self._dependents.get(metric, []))
+
+    def _recompute(self, name: str) -> bool:
+        """Recompute a derived metric and return True if its result changed."""
+        inputs, compute = self._derived[name]
+        if any(input_name not in self._values for input_name in inputs):
+            return False
+        result = compute({input_name: self._values[input_name] for input_name in inputs})
+        if result is None or self._results.get(name) == result:
+            return False
+        self._results[name] = result
+        self._values[name] = result[0]
+        for update_callback in list(self._listeners.get(name, [])):
+            update_callback()
+        return True
+
+    def async_add_listener(self, name: str, update_callback: Callable[[], None]) -> Callable[[], None]:
+        """Call ``update_callback`` whenever metric ``name`` changes."""
+        self._listeners.setdefault(name, []).append(update_callback)
+
+        def remove_listener() -> None:
+            self._listeners[name].remove(update_callback)
+
+        return remove_listener
+
+
+def population_safety_index(values: dict[str, Any]) -> tuple[float, dict[str, Any]] | None:
+    """Weighted 0-100 safety index from hazard and response sensors.
+
+    Returns None while any input has no usable value.
+    """
+    seismic = _number(values["japan_seismic_activity"])
+    weather = WEATHER_SAFETY.get(values["weather_emergency_status"])
+    infrastructure = _number(values["infrastructure_status"])
+    emergency_load = _number(values["emergency_services_load"])
+    response = RESPONSE_SAFETY.get(values["government_response_level"])
+    if None in (seismic, weather, infrastructure, emergency_load, response):
+        return None
+    safety_factors = {
+        "seismic_activity": max(0.0, 100 - seismic * 5),
+        "weather_conditions": weather,
+        "infrastructure_health": infrastructure,
+        "emergency_readiness": 100 - max(0.0, emergency_load - 50),
+        "government_response": response,
+    }
+    safety_index = sum(safety_factors[factor] * SAFETY_WEIGHTS[factor] for factor in safety_factors)
+    return round(safety_index, 1), {
+        "safety_factors": {factor: round(score, 1) for factor, score in safety_factors.items()},
+        "safety_level": "high" if safety_index > 80 else "medium" if safety_index > 60 else "low",
+    }
+
+
+def transportation_disruption(values: dict[str, Any]) -> tuple[float, dict[str, Any]] | None:
+    """Disruption index from the transport network and public transport sensors."""
+    network_operational = _number(values["transport_status"])
+    transport_health = _number(values["public_transport_health"])
+    if network_operational is None or transport_health is None:
+        return None
+    disruption = (100 - network_operational) / 2 + (100 - transport_health) / 2
+    return round(disruption, 1), {
+        "network_operational": network_operational,
+        "public_transport_health": transport_health,
+        "severity_level": "high" if disruption > 15 else "normal",
+    }
+
+
+def economic_impact_indicator(values: dict[str, Any]) -> tuple[float, dict[str, Any]] | None:
+    """Economic impact points from disruption, infrastructure and safety."""
+    disruption = _number(values["transportation_disruption"])
+    infrastructure = _number(values["infrastructure_status"])
+    safety = _number(values["population_safety_index"])
+    if None in (disruption, infrastructure, safety):
+        return None
+    impact_factors = {
+        "transportation_costs": round(1 + disruption / 30, 2),  # multiplier
+        "infrastructure_damage": round(1 + (100 - infrastructure) / 100, 2),
+        "business_disruption": round(1 + (100 - safety) / 100, 2),
+        "tourism_impact": round(1 - (100 - safety) / 240, 2),
+    }
+    cost = (
+        impact_factors["transportation_costs"]
+        + impact_factors["infrastructure_damage"]
+        + impact_factors["business_disruption"]
+    ) / 3
+    total = round(100 * cost * impact_factors["tourism_impact"], 1)
+    return total, {**impact_factors, "total_impact_index": total}
+
+
+def create_metric_graph() -> MetricGraph:
+    """Return the metric graph used by one config entry."""
+    graph = MetricGraph()
+    graph.add_derived(
+        "population_safety_index",
+        [
+            "japan_seismic_activity",
+            "weather_emergency_status",
+            "infrastructure_status",
+            "emergency_services_load",
+            "government_response_level",
+        ],
+        population_safety_index,
+    )
+    graph.add_derived(
+        "transportation_disruption",
+        ["transport_status", "public_transport_health"],
+        transportation_disruption,
+    )
+    graph.add_derived(
+        "economic_impact_indicator",
+        ["transportation_disruption", "infrastructure_status", "population_safety_index"],
+        economic_impact_indicator,
+    )
+    return graph
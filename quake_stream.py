@@ -0,0 +1,205 @@
+"""Push-based earthquake events from a P2PQuake-style WebSocket feed."""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import random
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, NamedTuple
+
+import aiohttp
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+
+from .const import (
+    QUAKE_HEARTBEAT,
+    QUAKE_MAX_EVENTS,
+    QUAKE_RECONNECT_BASE,
+    QUAKE_RECONNECT_MAX,
+)
+from .fetch import fetch_parsed
+
+_LOGGER = logging.getLogger(__name__)
+
+EARTHQUAKE_CODE = 551  # JMA earthquake information
+JST = timezone(timedelta(hours=9))
+
+# P2PQuake maxScale / scale codes to JMA seismic intensity.
+# 5-/5+ and 6-/6+ are mapped to x.0 / x.5 so the values stay ordered.
+SCALE_INTENSITY = {10: 1.0, 20: 2.0, 30: 3.0, 40: 4.0, 45: 5.0, 46: 5.0, 50: 5.5, 55: 6.0, 60: 6.5, 70: 7.0}
+SCALE_LABELS = {10: "1", 20: "2", 30: "3", 40: "4", 45: "5-", 46: "5-", 50: "5+", 55: "6-", 60: "6+", 70: "7"}
+
+
+class QuakeEvent(NamedTuple):
+    """One earthquake report."""
+
+    id: str
+    origin_time: datetime
+    hypocenter: str | None
+    latitude: float | None
+    longitude: float | None
+    depth_km: float | None
+    magnitude: float | None
+    max_intensity: float
+    max_scale: str | None
+    tsunami: str | None
+    prefecture_intensity: dict[str, float]
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**self._asdict(), "origin_time": self.origin_time.isoformat()}
+
+
+def _known(value: Any, unknown: float) -> float | None:
+    """Return ``value`` unless it is the feed's marker for an unknown value."""
+    return None if value is None or value <= unknown else float(value)
+
+
+def parse_quake_message(message: dict[str, Any]) -> QuakeEvent | None:
+    """Return the event in a feed message, or None for other message types."""
+    if message.get("code") != EARTHQUAKE_CODE:
+        return None
+    earthquake = message.get("earthquake") or {}
+    hypocenter = earthquake.get("hypocenter") or {}
+    try:
+        origin = datetime.strptime(earthquake["time"], "%Y/%m/%d %H:%M:%S").replace(tzinfo=JST)
+    except (KeyError, TypeError, ValueError):
+        return None
+    scale = earthquake.get("maxScale")
+    prefecture_intensity: dict[str, float] = {}
+    for point in message.get("points") or ():
+        pref = point.get("pref")
+        if pref:
+            intensity = SCALE_INTENSITY.get(point.get("scale"), 0.0)
+            prefecture_intensity[pref] = max(intensity, prefecture_intensity.get(pref, 0.0))
+    return QuakeEvent(
+        id=str(message.get("id") or message.get("_id") or f"{earthquake['time']}:{hypocenter.get('name')}"),
+        origin_time=origin,
+        hypocenter=hypocenter.get("name") or None,
+        latitude=_known(hypocenter.get("latitude"), -200),
+        longitude=_known(hypocenter.get("longitude"), -200),
+        depth_km=_known(hypocenter.get("depth"), -1),
+        magnitude=_known(hypocenter.get("magnitude"), -1),
+        max_intensity=SCALE_INTENSITY.get(scale, 0.0),
+        max_scale=SCALE_LABELS.get(scale),
+        tsunami=earthquake.get("domesticTsunami"),
+        prefecture_intensity=prefecture_intensity,
+    )
+
+
+class QuakeStream:
+    """Keep a WebSocket to the earthquake feed open and push events out.
+
+    Listeners are called as soon as a new event arrives. After every
+    (re)connection the recent history is fetched once, so events missed
+    while disconnected are recovered. Failed connections are retried with
+    exponential backoff and jitter.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        session: aiohttp.ClientSession,
+        url: str,
+        history_url: str | None = None,
+    ) -> None:
+        self.hass = hass
+        self.session = session
+        self.url = url
+        self.history_url = history_url
+        self.events: deque[QuakeEvent] = deque(maxlen=QUAKE_MAX_EVENTS)
+        self.connected = False
+        self._listeners: list[Callable[[], None]] = []
+        self._task: asyncio.Task | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start the connection loop in the background."""
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"bosai_watch quake stream {self.url}"
+            )
+
+    async def async_stop(self) -> None:
+        """Close the connection and stop reconnecting."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Call ``update_callback`` whenever new events arrive."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    def recent(self, window: timedelta, now: datetime | None = None) -> list[QuakeEvent]:
+        """Return events whose origin time falls within ``window``."""
+        cutoff = (now or datetime.now(timezone.utc)) - window
+        return [event for event in self.events if event.origin_time >= cutoff]
+
+    async def _async_run(self) -> None:
+        failures = 0
+        while True:
+            try:
+                async with self.session.ws_connect(self.url, heartbeat=QUAKE_HEARTBEAT) as ws:
+                    self.connected = True
+                    failures = 0
+                    _LOGGER.debug(f"Connected to quake stream {self.url}")
+                    await self._async_backfill()
+                    async for message in ws:
+                        if message.type == aiohttp.WSMsgType.TEXT:
+                            self._handle_payload(message.data)
+                        elif message.type == aiohttp.WSMsgType.ERROR:
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                _LOGGER.warning(f"Quake stream {self.url} failed: {exc}")
+            finally:
+                self.connected = False
+            failures += 1
+            delay = min(QUAKE_RECONNECT_MAX, QUAKE_RECONNECT_BASE * 2 ** (failures - 1))
+            await asyncio.sleep(delay * random.uniform(0.5, 1))
+
+    async def _async_backfill(self) -> None:
+        if not self.history_url:
+            return
+        try:
+            status, history = await fetch_parsed(self.session, self.history_url, json.loads)
+        except Exception as exc:
+            _LOGGER.warning(f"Failed to fetch quake history {self.history_url}: {exc}")
+            return
+        if status == 200 and isinstance(history, list):
+            # History is newest first
+            self._add_events(reversed(history))
+
+    def _handle_payload(self, text: str) -> None:
+        try:
+            message = json.loads(text)
+        except ValueError:
+            _LOGGER.debug(f"Ignoring malformed quake message: {text[:200]}")
+            return
+        self._add_events(message if isinstance(message, list) else [message])
+
+    def _add_events(self, messages: Iterable[dict[str, Any]]) -> None:
+        known = {event.id for event in self.events}
+        added = False
+        for message in messages:
+            event = parse_quake_message(message) if isinstance(message, dict) else None
+            if event is None or event.id in known:
+                continue
+            known.add(event.id)
+            self.events.append(event)
+            added = True
+        if added:
+            for update_callback in list(self._listeners):
+                update_callback()
@@ -0,0 +1,87 @@
+"""On-disk copy of the hub's last good remote payloads for warm starts."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Callable
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+_LOGGER = logging.getLogger(__name__)
+
+CACHE_VERSION = 1
+SAVE_DELAY = 60  # seconds; fetches within this window share one write
+MAX_AGE = 24 * 3600  # seconds; older payloads are not restored
+
+
+class ResponseCache:
+    """Payload bodies and HTTP validators by URL in one compressed file.
+
+    Each entry holds ``body``, ``etag``, ``last_modified`` and ``fetched_at``
+    (epoch seconds). Reads and writes run in the executor; writes go through
+    a temporary file so a crash never leaves a truncated cache behind.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: Path) -> None:
+        self.hass = hass
+        self.path = path
+        self._unsub_save: CALLBACK_TYPE | None = None
+        self._snapshot: Callable[[], dict[str, dict[str, Any]]] | None = None
+
+    async def async_load(self) -> dict[str, dict[str, Any]]:
+        """Return the entries that are still recent enough to use."""
+        try:
+            entries = await self.hass.async_add_executor_job(self._load)
+        except Exception as exc:
+            _LOGGER.warning(f"Ignoring unreadable response cache {self.path}: {exc}")
+            return {}
+        cutoff = time.time() - MAX_AGE
+        return {
+            url: entry for url, entry in entries.items()
+            if entry.get("fetched_at", 0) >= cutoff
+        }
+
+    def _load(self) -> dict[str, dict[str, Any]]:
+        if not self.path.exists():
+            return {}
+        data = json.loads(zlib.decompress(self.path.read_bytes()))
+        if data.get("version") != CACHE_VERSION:
+            return {}
+        return data["entries"]
+
+    def _write(self, entries: dict[str, dict[str, Any]]) -> None:
+        payload = json.dumps({"version": CACHE_VERSION, "entries": entries}, ensure_ascii=False)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_bytes(zlib.compress(payload.encode("utf-8")))
+        os.replace(tmp, self.path)
+
+    @callback
+    def async_delay_save(self, snapshot: Callable[[], dict[str, dict[str, Any]]]) -> None:
+        """Save ``snapshot()`` after ``SAVE_DELAY``, once for a burst of calls."""
+        self._snapshot = snapshot
+        if self._unsub_save is None:
+            self._unsub_save = async_call_later(self.hass, SAVE_DELAY, self._async_save_delayed)
+
+    async def _async_save_delayed(self, _now) -> None:
+        self._unsub_save = None
+        await self.async_save()
+
+    async def async_save(self) -> None:
+        """Write the pending snapshot now, if any."""
+        if self._unsub_save is not None:
+            self._unsub_save()
+            self._unsub_save = None
+        snapshot, self._snapshot = self._snapshot, None
+        if snapshot is None:
+            return
+        try:
+            await self.hass.async_add_executor_job(self._write, snapshot())
+        except Exception as exc:
+            _LOGGER.warning(f"Failed to save response cache {self.path}: {exc}")
@@ -0,0 +1,268 @@
+"""Batched Safecast radiation queries, nearest-device lookup and anomaly scoring."""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Iterable, Sequence
+from urllib.parse import urlencode
+
+SAFECAST_URL = "https://api.safecast.org/measurements.json"
+MAX_MEASUREMENTS = 1000  # most recent readings fetched per cycle
+QUERY_MARGIN_KM = 10  # extra radius around the outermost site
+MAX_DEVICE_DISTANCE_KM = 10  # readings further from a site are ignored
+CLUSTER_RADIUS_KM = 50  # sites within one query circle of this radius share it
+MAX_CACHED_INDEXES = 8  # device indexes kept, one per live measurement list
+GRID_CELL_DEG = 0.1  # about 11 km of latitude
+
+ANOMALY_ALPHA = 0.05  # EWMA weight once warmed up, ~20 readings of memory
+ANOMALY_MIN_SAMPLES = 10  # readings before z-scores are reported
+ANOMALY_STD_FLOOR = 0.005  # μSv/h; keeps a flat baseline from flagging noise
+ANOMALY_ZSCORE = 4.0
+ANOMALY_MIN_DELTA = 0.02  # μSv/h above the baseline for a reading to count
+AREA_CELL_DEG = 0.5
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance between two points."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def _covering_circle(sites: Sequence[tuple[float, float]]) -> tuple[float, float, float]:
+    """Return the centre and radius of the circle around the sites' bounding box."""
+    lats = [lat for lat, _ in sites]
+    lons = [lon for _, lon in sites]
+    center_lat = (min(lats) + max(lats)) / 2
+    center_lon = (min(lons) + max(lons)) / 2
+    radius = max(distance_km(center_lat, center_lon, lat, lon) for lat, lon in sites)
+    return center_lat, center_lon, radius
+
+
+def measurements_url(sites: Iterable[tuple[float, float]]) -> str:
+    """Return one query covering the bounding box of every site.
+
+    The API filters by distance around a point, so the box is expressed as
+    its centre and the radius reaching its corners.
+    """
+    center_lat, center_lon, radius = _covering_circle(list(sites))
+    query = {
+        "latitude": round(center_lat, 4),
+        "longitude": round(center_lon, 4),
+        "distance": math.ceil(radius + QUERY_MARGIN_KM),
+        "unit": "usvph",
+        "order": "desc",
+        "sort": "measured_at",
+        "limit": MAX_MEASUREMENTS,
+    }
+    return f"{SAFECAST_URL}?{urlencode(query)}"
+
+
+def measurements_urls(sites: Iterable[tuple[float, float]]) -> list[str]:
+    """Return the query for each site, shared by sites close to each other.
+
+    A query returns the MAX_MEASUREMENTS most recent readings anywhere in
+    its circle, so one circle over distant sites can be filled by a busy
+    area and return nothing near the others. Sites are instead grouped
+    greedily into clusters whose circle stays within CLUSTER_RADIUS_KM, one
+    query per cluster: more requests for scattered sites, in exchange for
+    readings around every site.
+    """
+    sites = list(sites)
+    clusters: list[list[int]] = []
+    for index, site in enumerate(sites):
+        for cluster in clusters:
+            if _covering_circle([sites[i] for i in cluster] + [site])[2] <= CLUSTER_RADIUS_KM:
+                cluster.append(index)
+                break
+        else:
+            clusters.append([index])
+    urls = [""] * len(sites)
+    for cluster in clusters:
+        url = measurements_url(sites[i] for i in cluster)
+        for index in cluster:
+            urls[index] = url
+    return urls
+
+
+def device_key(reading: dict[str, Any]) -> Any:
+    """Identify a device, falling back to its position for anonymous readings."""
+    device = reading.get("device_id")
+    return (reading["latitude"], reading["longitude"]) if device is None else device
+
+
+class DeviceIndex:
+    """Latest reading per device, bucketed on a lat/lon grid.
+
+    A nearest lookup searches rings of cells outward from the query point and
+    stops once no unvisited cell can hold a closer device.
+    """
+
+    def __init__(self, measurements: Sequence[dict[str, Any]]) -> None:
+        self._cells: dict[tuple[int, int], list[dict[str, Any]]] = {}
+        latest: dict[Any, dict[str, Any]] = {}
+        # Measurements arrive newest first; keep the first one per device
+        for reading in measurements:
+            if reading.get("latitude") is None or reading.get("longitude") is None:
+                continue
+            device = device_key(reading)
+            latest.setdefault(device, reading)
+        self.latest = latest
+        for reading in latest.values():
+            self._cells.setdefault(self._cell(reading["latitude"], reading["longitude"]), []).append(reading)
+
+    @staticmethod
+    def _cell(lat: float, lon: float) -> tuple[int, int]:
+        return math.floor(lat / GRID_CELL_DEG), math.floor(lon / GRID_CELL_DEG)
+
+    def nearest(
+        self, lat: float, lon: float, max_km: float = MAX_DEVICE_DISTANCE_KM
+    ) -> tuple[dict[str, Any], float] | None:
+        """Return the reading closest to a point within ``max_km``, and its distance."""
+        row, col = self._cell(lat, lon)
+        # Kilometres covered by one cell in the narrower (longitude) direction
+        cell_km = GRID_CELL_DEG * math.radians(EARTH_RADIUS_KM) * max(math.cos(math.radians(lat)), 0.1)
+        best: tuple[dict[str, Any], float] | None = None
+        ring = 0
+        while (ring - 1) * cell_km <= min(max_km, best[1] if best else max_km):
+            for cell in self._ring(row, col, ring):
+                for reading in self._cells.get(cell, ()):
+                    distance = distance_km(lat, lon, reading["latitude"], reading["longitude"])
+                    if distance <= max_km and (best is None or distance < best[1]):
+                        best = (reading, distance)
+            ring += 1
+        return best
+
+    @staticmethod
+    def _ring(row: int, col: int, ring: int) -> Iterable[tuple[int, int]]:
+        if ring == 0:
+            yield row, col
+            return
+        for d in range(-ring, ring + 1):
+            yield row - ring, col + d
+            yield row + ring, col + d
+        for d in range(-ring + 1, ring):
+            yield row + d, col - ring
+            yield row + d, col + ring
+
+
+# Indexes by list identity; each entry keeps its list alive so ids stay unique
+_index_cache: dict[int, tuple[Sequence, DeviceIndex]] = {}
+
+
+def device_index(measurements: Sequence[dict[str, Any]]) -> DeviceIndex:
+    """Return the index for a measurement list, built once per list.
+
+    The site sensors of a cluster read the same decoded list from the hub,
+    so the index is built once per fetch and cluster.
+    """
+    cached = _index_cache.get(id(measurements))
+    if cached is not None and cached[0] is measurements:
+        return cached[1]
+    index = DeviceIndex(measurements)
+    _index_cache[id(measurements)] = (measurements, index)
+    if len(_index_cache) > MAX_CACHED_INDEXES:
+        del _index_cache[next(iter(_index_cache))]
+    return index
+
+
+class RunningStats:
+    """Streaming mean and variance in constant memory.
+
+    Updates are exact (Welford) until ``1 / count`` drops below ``alpha``,
+    then become exponentially weighted so the baseline follows slow drift.
+    """
+
+    __slots__ = ("alpha", "count", "mean", "var")
+
+    def __init__(self, alpha: float) -> None:
+        self.alpha = alpha
+        self.count = 0
+        self.mean = 0.0
+        self.var = 0.0
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        weight = max(1 / self.count, self.alpha)
+        diff = value - self.mean
+        increment = weight * diff
+        self.mean += increment
+        self.var = (1 - weight) * (self.var + diff * increment)
+
+    def zscore(self, value: float) -> float | None:
+        """Standard score of ``value`` against the baseline, once warmed up."""
+        if self.count < ANOMALY_MIN_SAMPLES:
+            return None
+        return (value - self.mean) / max(math.sqrt(self.var), ANOMALY_STD_FLOOR)
+
+
+class RadiationAnomalyDetector:
+    """Flag readings that stand out from each device's and area's baseline.
+
+    Each new reading is scored against the statistics accumulated before it,
+    then folded into them, so no raw history is kept. Areas are coarse
+    lat/lon cells pooling every device inside them.
+    """
+
+    def __init__(self) -> None:
+        self._devices: dict[Any, RunningStats] = {}
+        self._areas: dict[tuple[int, int], RunningStats] = {}
+        self._last_seen: dict[Any, Any] = {}
+        self.device_scores: dict[Any, float | None] = {}
+        self.area_scores: dict[tuple[int, int], float | None] = {}
+        self.anomalous_devices: set = set()
+        self._last_measurements: dict[Any, Sequence] = {}
+
+    @staticmethod
+    def area_of(lat: float, lon: float) -> tuple[int, int]:
+        return math.floor(lat / AREA_CELL_DEG), math.floor(lon / AREA_CELL_DEG)
+
+    def update(self, measurements: Sequence[dict[str, Any]], source: Any = None) -> None:
+        """Score readings not seen before; a list repeated by ``source`` is ignored."""
+        if self._last_measurements.get(source) is measurements:
+            return
+        self._last_measurements[source] = measurements
+        area_updates: dict[tuple[int, int], float] = {}
+        # Oldest first, so each device's stream is scored in time order
+        for reading in reversed(measurements):
+            value = reading.get("value")
+            lat, lon = reading.get("latitude"), reading.get("longitude")
+            if value is None or lat is None or lon is None:
+                continue
+            device = device_key(reading)
+            stamp = reading.get("measured_at")
+            if stamp is not None and self._last_seen.get(device) is not None and stamp <= self._last_seen[device]:
+                continue
+            self._last_seen[device] = stamp
+
+            area = self.area_of(lat, lon)
+            device_stats = self._devices.setdefault(device, RunningStats(ANOMALY_ALPHA))
+            area_stats = self._areas.setdefault(area, RunningStats(ANOMALY_ALPHA))
+            device_z = device_stats.zscore(value)
+            self.device_scores[device] = device_z
+            area_z = area_stats.zscore(value)
+            if area_z is not None and (area not in area_updates or area_z > area_updates[area]):
+                area_updates[area] = area_z
+            if (
+                device_z is not None
+                and device_z >= ANOMALY_ZSCORE
+                and value - device_stats.mean >= ANOMALY_MIN_DELTA
+            ):
+                self.anomalous_devices.add(device)
+            else:
+                self.anomalous_devices.discard(device)
+            device_stats.update(value)
+            area_stats.update(value)
+        # An area reports the highest score among its new readings
+        self.area_scores.update(area_updates)
+
+    def baseline(self, device: Any) -> float | None:
+        stats = self._devices.get(device)
+        return stats.mean if stats else None
+
+
+RADIATION_DETECTOR = RadiationAnomalyDetector()
@@ -0,0 +1,338 @@
+"""Benchmark Bosai Watch import, setup and update cycles.
+
+Every remote URL in the sensor source tables is pointed at a local stand-in
+server, so runs are repeatable and offline. Reports:
+
+* cold import time of the sensor platform (``python -X importtime``)
+* ``async_setup_entry`` latency and allocations
+* one full update cycle (hub fetch and every sensor update) with per-sensor
+  latency, allocations, the number of requests served and the number of
+  entities whose state changed, followed by a second, warm cycle that should
+  be answered with 304s and change only the seismic sensors and the composite
+  metrics computed from them, as the stand-in quake feed keeps pushing new
+  earthquakes
+* setting up a second config entry for another area, which adds only the
+  per-area sensors, and a cycle with both entries loaded, which should make
+  no more requests than one entry
+* latency from an earthquake push leaving the stand-in feed to the stream
+  delivering it
+
+Run from the integration directory with Home Assistant installed::
+
+    python scripts/benchmark.py [--json] [--top N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import urlsplit
+
+from aiohttp import web
+from quake_standin import create_app as create_quake_app
+
+PACKAGE_DIR = Path(__file__).resolve().parents[1]
+PACKAGE = "custom_components.bosai_watch"
+
+
+def _link_package(root: Path) -> None:
+    """Expose the integration as ``custom_components.bosai_watch`` under ``root``."""
+    (root / "custom_components").mkdir()
+    (root / "custom_components" / "bosai_watch").symlink_to(PACKAGE_DIR, target_is_directory=True)
+    sys.path.insert(0, str(root))
+
+
+def measure_import(root: Path) -> dict:
+    """Import the sensor platform in a fresh interpreter and parse -X importtime."""
+    env = {**os.environ, "PYTHONPATH": str(root)}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {PACKAGE}.sensor"],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    cumulative: dict[str, int] = {}
+    own: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (part.strip() for part in line[12:].split("|"))
+        if not self_us.isdigit():
+            continue
+        cumulative[name] = int(cumulative_us)
+        if name.startswith(PACKAGE):
+            own[name] = int(self_us)
+    return {
+        "sensor_platform_ms": cumulative.get(f"{PACKAGE}.sensor", 0) / 1000,
+        "package_ms": cumulative.get(PACKAGE, 0) / 1000,
+        "package_modules_self_ms": {
+            name: us / 1000 for name, us in sorted(own.items(), key=lambda kv: -kv[1])
+        },
+    }
+
+
+class StandInServer:
+    """Serve bundled samples in place of every remote data source.
+
+    Responses carry an ETag, so conditional requests are answered with 304
+    just as a well-behaved upstream would.
+    """
+
+    def __init__(self) -> None:
+        self.requests: Counter = Counter()
+        self.not_modified = 0
+        self._bodies: dict[str, tuple[str, str]] = {}
+        self._runner: web.AppRunner | None = None
+        self.base_url = ""
+        self.quake_app: web.Application | None = None
+
+    async def start(self) -> None:
+        app = web.Application()
+        self.quake_app = create_quake_app(interval=0.2)
+        app.add_subapp("/quake/", self.quake_app)
+        app.router.add_get("/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        self.requests[request.path] += 1
+        body, content_type = self._bodies.get(request.path, ("{}", "application/json"))
+        etag = '"' + hashlib.blake2b(body.encode("utf-8"), digest_size=8).hexdigest() + '"'
+        if request.headers.get("If-None-Match") == etag:
+            self.not_modified += 1
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(text=body, content_type=content_type, headers={"ETag": etag})
+
+    def redirect(self, sources: dict[str, str], safecast_sites: list[tuple[float, float]]) -> None:
+        """Point every remote URL in ``sources`` at this server, in place."""
+        from custom_components.bosai_watch.feeds import is_feed_url
+
+        rss = (PACKAGE_DIR / "data" / "rss_sample.xml").read_text(encoding="utf-8")
+        weather = (PACKAGE_DIR / "data" / "weather_sample.json").read_text(encoding="utf-8")
+        for key, url in sources.items():
+            if not url.startswith(("http://", "https://")):
+                continue
+            if key.startswith("safecast"):
+                path = f"/{key}/measurements.json"
+                body = (_safecast_measurements(safecast_sites), "application/json")
+            elif is_feed_url(url):
+                path = f"/{key}.xml"
+                body = (rss, "application/rss+xml")
+            elif urlsplit(url).path.endswith(".json"):
+                path = f"/{key}.json"
+                body = (weather, "application/json")
+            else:
+                path = f"/{key}"
+                body = ("{}", "application/json")
+            self._bodies[path] = body
+            sources[key] = self.base_url + path
+
+
+def _safecast_measurements(sites: list[tuple[float, float]], per_site: int = 50) -> str:
+    readings = []
+    for site_index, (lat, lon) in enumerate(sites):
+        for device in range(per_site):
+            readings.append({
+                "device_id": site_index * per_site + device,
+                "latitude": lat + (device % 10 - 5) * 0.01,
+                "longitude": lon + (device // 10 - 2) * 0.01,
+                "value": 0.05 + (device % 7) * 0.005,
+                "measured_at": "2024-01-01T00:00:00Z",
+            })
+    return json.dumps(readings)
+
+
+async def _timed(coro) -> tuple[float, int]:
+    """Await ``coro`` and return its wall time in ms and net allocated bytes."""
+    before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    await coro
+    elapsed = (time.perf_counter() - start) * 1000
+    after = tracemalloc.take_snapshot()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return elapsed, allocated
+
+
+def _is_derived(entity) -> bool:
+    metrics = getattr(entity, "_metrics", None)
+    return metrics is not None and metrics.is_derived(entity._sensor_id)
+
+
+async def _measure_push_latency(stream, quake_app: web.Application, timeout: float = 10) -> float | None:
+    """Wait for the next pushed event and return its delivery latency in ms."""
+    received = asyncio.get_running_loop().create_future()
+    remove = stream.async_add_listener(
+        lambda: received.done() or received.set_result(time.monotonic())
+    )
+    try:
+        arrived = await asyncio.wait_for(received, timeout)
+    except TimeoutError:
+        return None
+    finally:
+        remove()
+    return (arrived - quake_app["last_sent_at"]) * 1000
+
+
+async def run_cycles(config_dir: Path, top: int) -> dict:
+    from homeassistant.core import HomeAssistant
+
+    integration = __import__(PACKAGE, fromlist=["*"])
+    from custom_components.bosai_watch import sensor as platform
+
+    server = StandInServer()
+    await server.start()
+    sites = [(config["latitude"], config["longitude"]) for config in platform.SAFETY_SENSORS]
+    server.redirect(platform.DATA_SOURCES, sites)
+    server.redirect(platform.ADDITIONAL_DATA_SOURCES, sites)
+
+    (config_dir / "bosai_watch_secrets.yaml").write_text(
+        f"quake_stream_url: {server.base_url.replace('http', 'ws', 1)}/quake/v2/ws\n"
+        f"quake_history_url: {server.base_url}/quake/v2/history\n",
+        encoding="utf-8",
+    )
+    hass = HomeAssistant(str(config_dir))
+    entities: list = []
+    unloads: dict[str, list] = {}
+
+    async def forward_entry_setups(entry, platforms) -> None:
+        await platform.async_setup_entry(hass, entry, lambda new, *_: entities.extend(new))
+
+    async def unload_platforms(entry, platforms) -> bool:
+        return True
+
+    hass.config_entries = SimpleNamespace(
+        async_forward_entry_setups=forward_entry_setups,
+        async_unload_platforms=unload_platforms,
+    )
+
+    def make_entry(entry_id: str, data: dict) -> SimpleNamespace:
+        return SimpleNamespace(
+            entry_id=entry_id, data=data, options={},
+            async_on_unload=unloads.setdefault(entry_id, []).append,
+        )
+
+    entries = [make_entry("benchmark", {})]
+    tracemalloc.start()
+    report: dict = {}
+    try:
+        setup_ms, setup_bytes = await _timed(integration.async_setup_entry(hass, entries[0]))
+        report["setup"] = {"ms": setup_ms, "allocated_bytes": setup_bytes, "entities": len(entities)}
+        hub = hass.data[integration.DOMAIN]["pipeline"]["hub"]
+        for entity in entities:
+            entity.hass = hass
+        urls = {url for entity in entities for url in getattr(entity, "source_urls", ())}
+
+        # Fukushima next to the default Tokyo area
+        entries.append(make_entry("benchmark_second_area", {"area_code": "070000"}))
+        first_count = len(entities)
+        second_ms, second_bytes = await _timed(integration.async_setup_entry(hass, entries[1]))
+        report["second_entry_setup"] = {
+            "ms": second_ms, "allocated_bytes": second_bytes, "entities": len(entities) - first_count,
+        }
+        for entity in entities[first_count:]:
+            entity.hass = hass
+
+        update_order = sorted(entities, key=_is_derived)
+        for label in ("cold_cycle", "warm_cycle"):
+            server.requests.clear()
+            server.not_modified = 0
+            fetch_ms, fetch_bytes = await _timed(hub.async_refresh(urls))
+            fingerprints = [entity._fingerprint for entity in entities]
+            per_sensor = {}
+            # Derived metrics last, as in Home Assistant they update when the
+            # metric graph publishes their inputs
+            for entity in update_order:
+                elapsed, allocated = await _timed(entity.async_update())
+                per_sensor[entity.name] = {"ms": elapsed, "allocated_bytes": allocated}
+            await hass.async_block_till_done()
+            slowest = sorted(per_sensor.items(), key=lambda kv: -kv[1]["ms"])[:top]
+            report[label] = {
+                "hub_fetch_ms": fetch_ms,
+                "hub_fetch_allocated_bytes": fetch_bytes,
+                "sources": len(urls),
+                "sensor_updates_ms": sum(sensor["ms"] for sensor in per_sensor.values()),
+                "slowest_sensors": dict(slowest),
+                "requests": sum(server.requests.values()),
+                "not_modified": server.not_modified,
+                "changed_entities": sum(
+                    entity._fingerprint != before for entity, before in zip(entities, fingerprints)
+                ),
+            }
+        report["peak_traced_bytes"] = tracemalloc.get_traced_memory()[1]
+        report["quake_push_latency_ms"] = await _measure_push_latency(
+            hass.data[integration.DOMAIN]["pipeline"]["quake_stream"], server.quake_app
+        )
+    finally:
+        tracemalloc.stop()
+        for entry in reversed(entries):
+            for unload in reversed(unloads.get(entry.entry_id, [])):
+                unload()
+            if entry.entry_id in hass.data.get(integration.DOMAIN, {}):
+                await integration.async_unload_entry(hass, entry)
+        await hass.async_block_till_done()
+        await server.stop()
+    return report
+
+
+def _print_report(report: dict) -> None:
+    imports = report["import"]
+    print(f"import sensor platform   {imports['sensor_platform_ms']:8.1f} ms")
+    print(f"import package           {imports['package_ms']:8.1f} ms")
+    for name, ms in list(imports["package_modules_self_ms"].items())[:5]:
+        print(f"  {name:<38} {ms:7.1f} ms self")
+    setup = report["setup"]
+    print(f"async_setup_entry        {setup['ms']:8.1f} ms  {setup['allocated_bytes'] / 1024:8.1f} KiB  {setup['entities']} entities")
+    second = report["second_entry_setup"]
+    print(f"second area entry        {second['ms']:8.1f} ms  {second['allocated_bytes'] / 1024:8.1f} KiB  {second['entities']} entities")
+    for label in ("cold_cycle", "warm_cycle"):
+        cycle = report[label]
+        print(f"{label:<24} hub {cycle['hub_fetch_ms']:.1f} ms for {cycle['sources']} sources, "
+              f"{cycle['requests']} requests ({cycle['not_modified']} not modified), "
+              f"sensors {cycle['sensor_updates_ms']:.1f} ms, {cycle['changed_entities']} changed")
+        # Net allocation: negative when an update frees the previous payload's state
+        for name, sensor in cycle["slowest_sensors"].items():
+            print(f"  {name:<46} {sensor['ms']:7.2f} ms  {sensor['allocated_bytes'] / 1024:8.1f} KiB net")
+    latency = report["quake_push_latency_ms"]
+    print(f"quake push latency       {latency:8.1f} ms" if latency is not None else "quake push latency       no event")
+    print(f"peak traced memory       {report['peak_traced_bytes'] / 1024:8.1f} KiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--top", type=int, default=5, help="slowest sensors to list per cycle")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _link_package(root)
+        config_dir = root / "config"
+        config_dir.mkdir()
+        report = {"import": measure_import(root)}
+        report.update(asyncio.run(run_cycles(config_dir, args.top)))
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Build the bundled JMA area index from JMA's ``area.json``.
+
+Download the area definitions published by JMA and convert them to the
+compact index loaded by ``areas.py``::
+
+    python scripts/build_area_index.py [area.json] [-o data/jma_areas.json]
+
+Without a file argument, ``area.json`` is fetched from JMA.
+
+The index is one row per area, ``[code, level, parent, name, enName]``,
+with ``level`` an index into ``levels`` and ``parent`` empty for regional
+centers. Children are not stored; they are rebuilt from the parents when
+the index is loaded.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import urllib.request
+from pathlib import Path
+
+AREA_URL = "https://www.jma.go.jp/bosai/common/const/area.json"
+OUTPUT = Path(__file__).resolve().parents[1] / "data" / "jma_areas.json"
+LEVELS = ("centers", "offices", "class10s", "class15s", "class20s")
+
+# Prefecture names by JIS X 0401 code, the first two digits of every
+# office and sub-area code
+PREFECTURES = {
+    "01": "北海道", "02": "青森県", "03": "岩手県", "04": "宮城県", "05": "秋田県",
+    "06": "山形県", "07": "福島県", "08": "茨城県", "09": "栃木県", "10": "群馬県",
+    "11": "埼玉県", "12": "千葉県", "13": "東京都", "14": "神奈川県", "15": "新潟県",
+    "16": "富山県", "17": "石川県", "18": "福井県", "19": "山梨県", "20": "長野県",
+    "21": "岐阜県", "22": "静岡県", "23": "愛知県", "24": "三重県", "25": "滋賀県",
+    "26": "京都府", "27": "大阪府", "28": "兵庫県", "29": "奈良県", "30": "和歌山県",
+    "31": "鳥取県", "32": "島根県", "33": "岡山県", "34": "広島県", "35": "山口県",
+    "36": "徳島県", "37": "香川県", "38": "愛媛県", "39": "高知県", "40": "福岡県",
+    "41": "佐賀県", "42": "長崎県", "43": "熊本県", "44": "大分県", "45": "宮崎県",
+    "46": "鹿児島県", "47": "沖縄県",
+}
+
+
+def build_index(areas: dict) -> dict:
+    """Return the compact index for the parsed contents of ``area.json``."""
+    rows = []
+    for level, key in enumerate(LEVELS):
+        for code, area in areas.get(key, {}).items():
+            rows.append([code, level, area.get("parent", ""), area["name"], area.get("enName", "")])
+    rows.sort(key=lambda row: (row[1], row[0]))
+    return {"version": 1, "levels": list(LEVELS), "prefectures": PREFECTURES, "areas": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", type=Path, nargs="?", help=f"JMA area.json (default: download {AREA_URL})")
+    parser.add_argument("-o", "--output", type=Path, default=OUTPUT)
+    args = parser.parse_args()
+    if args.source is None:
+        with urllib.request.urlopen(AREA_URL, timeout=30) as response:
+            areas = json.load(response)
+    else:
+        areas = json.loads(args.source.read_text(encoding="utf-8"))
+    index = build_index(areas)
+    args.output.write_text(
+        json.dumps(index, ensure_ascii=False, separators=(",", ":")) + "\n", encoding="utf-8"
+    )
+    print(f"Wrote {len(index['areas'])} areas to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
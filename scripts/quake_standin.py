@@ -0,0 +1,97 @@
+"""Local stand-in for the P2PQuake WebSocket and history API.
+
+Replays ``data/quake_sample.json`` so the push path can be exercised
+offline. Point the integration at it from ``bosai_watch_secrets.yaml``::
+
+    quake_stream_url: ws://127.0.0.1:8765/v2/ws
+    quake_history_url: http://127.0.0.1:8765/v2/history
+
+and run::
+
+    python scripts/quake_standin.py [--port 8765] [--interval 10] [--drop-after N]
+
+Each connected client gets the sample events oldest first, one every
+``--interval`` seconds, each with a fresh id so they count as new.
+``--drop-after`` closes connections after N messages to exercise
+reconnection.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import copy
+import itertools
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from aiohttp import web
+
+SAMPLE = Path(__file__).resolve().parents[1] / "data" / "quake_sample.json"
+JST = timezone(timedelta(hours=9))
+
+
+def load_events() -> list[dict]:
+    """Return the sample events, newest first as the history API does."""
+    return json.loads(SAMPLE.read_text(encoding="utf-8"))
+
+
+def _restamp(event: dict, serial: int) -> dict:
+    """Copy ``event`` as a fresh report happening now."""
+    event = copy.deepcopy(event)
+    now = datetime.now(JST)
+    event["id"] = f"standin-{serial}"
+    event["time"] = now.strftime("%Y/%m/%d %H:%M:%S.%f")[:-3]
+    event["earthquake"]["time"] = now.strftime("%Y/%m/%d %H:%M:%S")
+    return event
+
+
+def create_app(interval: float = 10, drop_after: int | None = None) -> web.Application:
+    """Build the stand-in application; usable from benchmarks and scripts."""
+    events = load_events()
+    serials = itertools.count(1)
+    app = web.Application()
+    app["sent"] = 0
+    app["last_sent_at"] = None  # time.monotonic() of the latest push
+
+    async def history(request: web.Request) -> web.Response:
+        return web.json_response(events)
+
+    async def stream(request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        sent = 0
+        for event in itertools.cycle(reversed(events)):
+            if ws.closed or (drop_after is not None and sent >= drop_after):
+                break
+            await asyncio.sleep(interval)
+            message = json.dumps(_restamp(event, next(serials)), ensure_ascii=False)
+            app["last_sent_at"] = time.monotonic()
+            try:
+                await ws.send_str(message)
+            except ConnectionResetError:
+                break
+            sent += 1
+            app["sent"] += 1
+        await ws.close()
+        return ws
+
+    app.router.add_get("/v2/history", history)
+    app.router.add_get("/v2/ws", stream)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--interval", type=float, default=10, help="seconds between pushed events")
+    parser.add_argument("--drop-after", type=int, default=None, help="close connections after N events")
+    args = parser.parse_args()
+    web.run_app(create_app(args.interval, args.drop_after), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,35 @@
 # Bosai Watch Sensor Integration - Ultimate Edition with Government APIs
 
-from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.components.sensor import RestoreSensor, SensorStateClass
 from homeassistant.const import PERCENTAGE
+from homeassistant.core import callback
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_call_later
 import aiohttp
 import logging
 import json
+import random
+import statistics
 from pathlib import Path
-from datetime import timedelta, datetime
-from .const import DOMAIN
+from datetime import datetime, timedelta
+from .const import ALERT_WINDOW, AREA_CODE, AREA_SENSOR_IDS, CONF_AREA_CODE, DOMAIN, SCAN_INTERVAL, STARTUP_STAGGER
+from .areas import Area, area_warnings, get_area_index, warning_kind
+from .cache import PayloadCache
+from .coordinator import BosaiDataHub
+from .fetch import fetch_parsed
+from .history import HistoryStore
+from .item_index import SeenItemIndex
+from .jma import OPEN_METEO_URL, forecasts_url, split_forecasts
+from .keywords import HAZARD_MATCHER
+from .metrics import MetricGraph
+from .quake_stream import QuakeStream
+from .safecast import RADIATION_DETECTOR, device_index, device_key, measurements_urls
 
 _LOGGER = logging.getLogger(__name__)
 
 # Local data directory for offline samples
 DATA_DIR = Path(__file__).resolve().parent / "data"
 
-SCAN_INTERVAL = timedelta(seconds=180)  # 3 minutes for comprehensive monitoring
-
 # Comprehensive data source URLs
 DATA_SOURCES = {
     # Japanese Government APIs
@@ -36,8 +49,8 @@ DATA_SOURCES = {
     "nhk_science": f"file://{DATA_DIR / 'rss_sample.xml'}",
     
     # Weather and Disaster APIs
-    "jma_open_meteo": f"file://{DATA_DIR / 'weather_sample.json'}",
     "disaster_warnings": "http://agora.ex.nii.ac.jp/cps/weather/warning/",
+    "jma_warnings": "https://www.jma.go.jp/bosai/warning/data/warning/map.json",
     "sip4d_api": "https://www.sip4d.jp/api/",
     
     # Transportation APIs
@@ -66,18 +79,6 @@ DATA_SOURCES = {
 }
 
 
-async def _get_content(session: aiohttp.ClientSession, url: str) -> tuple[int, str]:
-    """Fetch content from a URL or local file."""
-    if url.startswith("file://"):
-        path = url[7:]
-        try:
-            return 200, Path(path).read_text(encoding="utf-8")
-        except Exception as exc:
-            _LOGGER.error(f"Error reading {path}: {exc}")
-            return 500, ""
-    async with session.get(url, timeout=10) as response:
-        return response.status, await response.text()
-
 # Additional comprehensive data sources and sensors
 # Adding to the existing Bosai Watch sensor implementation
 
@@ -121,6 +122,62 @@ ADDITIONAL_DATA_SOURCES = {
     "yahoo_disaster_map": "https://typhoon.yahoo.co.jp/weather/api/",
 }
 
+# News feeds aggregated by the multi-source news monitor
+NEWS_SOURCES = {
+    "NHK": "nhk_main",
+    "NHK_Disaster": "nhk_disaster",
+    "NHK_Science": "nhk_science",
+    "Mainichi": "mainichi_rss",
+    "Asahi": "asahi_rss",
+    "Yomiuri": "yomiuri_rss",
+    "Nikkei": "nikkei_rss",
+    "Kyodo": "kyodo_news",
+    "Japan_Times": "japan_times",
+    "Mainichi_English": "mainichi_english",
+}
+
+# Refresh interval per hub source; sources not listed use SCAN_INTERVAL.
+# Hazard feeds refresh quickly, general news and forecasts less often.
+SOURCE_INTERVALS = {
+    "nhk_disaster": timedelta(minutes=1),
+    "jma_warnings": timedelta(minutes=1),
+    "jma_open_meteo": timedelta(minutes=10),
+    "safecast": timedelta(minutes=10),
+    "nhk_politics": timedelta(minutes=10),
+    "mainichi_rss": timedelta(minutes=10),
+    "asahi_rss": timedelta(minutes=10),
+    "yomiuri_rss": timedelta(minutes=10),
+    "nikkei_rss": timedelta(minutes=10),
+    "kyodo_news": timedelta(minutes=10),
+    "japan_times": timedelta(minutes=10),
+    "mainichi_english": timedelta(minutes=10),
+}
+
+
+def _round_score(score):
+    return None if score is None else round(score, 2)
+
+# DATA_SOURCES keys of the Safecast queries, one per cluster of nearby
+# SAFETY_SENSORS sites; filled in once the sites are defined below
+SAFECAST_SOURCES: list[str] = []
+
+
+def _source_url(key: str) -> str:
+    """Return the URL for a key of DATA_SOURCES or ADDITIONAL_DATA_SOURCES."""
+    return DATA_SOURCES.get(key) or ADDITIONAL_DATA_SOURCES[key]
+
+# Update handlers by sensor id. Each entity binds its handler once at
+# construction, so adding a sensor only needs a config entry and a handler.
+SENSOR_HANDLERS = {}
+
+
+def sensor_handler(sensor_id: str):
+    """Register the decorated method as the update handler for ``sensor_id``."""
+    def decorator(func):
+        SENSOR_HANDLERS[sensor_id] = func
+        return func
+    return decorator
+
 # Comprehensive sensor definitions for Ultimate Edition
 COMPREHENSIVE_SENSORS = [
     {
@@ -130,7 +187,8 @@ COMPREHENSIVE_SENSORS = [
         "unit": "intensity",
         "device_class": None,
         "state_class": SensorStateClass.MEASUREMENT,
-        "description": "Real-time seismic activity monitoring across Japan"
+        "description": "Real-time seismic activity monitoring across Japan",
+        "stream": "quake"
     },
     {
         "id": "disaster_alert_level", 
@@ -139,7 +197,8 @@ COMPREHENSIVE_SENSORS = [
         "unit": None,
         "device_class": None,
         "state_class": None,  # String values
-        "description": "Aggregated disaster alert level from government sources"
+        "description": "Aggregated disaster alert level from government sources",
+        "sources": ["nhk_disaster", "jma_warnings"]
     },
     {
         "id": "weather_emergency_status",
@@ -148,7 +207,8 @@ COMPREHENSIVE_SENSORS = [
         "unit": None,
         "device_class": None,
         "state_class": None,  # String values
-        "description": "JMA weather emergency and severe weather alerts"
+        "description": "JMA weather emergency and severe weather alerts",
+        "sources": ["jma_open_meteo"]
     },
     {
         "id": "transportation_disruption",
@@ -166,7 +226,8 @@ COMPREHENSIVE_SENSORS = [
         "unit": PERCENTAGE,
         "device_class": None,
         "state_class": SensorStateClass.MEASUREMENT,
-        "description": "Power, water, telecommunications infrastructure health"
+        "description": "Power, water, telecommunications infrastructure health",
+        "sources": ["nhk_main"]
     },
     {
         "id": "emergency_services_load",
@@ -211,7 +272,8 @@ COMPREHENSIVE_SENSORS = [
         "unit": None,
         "device_class": None,
         "state_class": None,  # String values
-        "description": "Government disaster response activation level"
+        "description": "Government disaster response activation level",
+        "sources": ["nhk_politics"]
     }
 ]
 
@@ -251,7 +313,8 @@ EXTENDED_SENSORS = [
         "unit": "μSv/h",
         "device_class": None,
         "state_class": SensorStateClass.MEASUREMENT,
-        "description": "Environmental radiation monitoring"
+        "description": "Environmental radiation monitoring",
+        "sources": SAFECAST_SOURCES
     },
     {
         "id": "air_quality_index",
@@ -309,6 +372,20 @@ EXTENDED_SENSORS = [
     }
 ]
 
+# Aggregator sensor configurations
+AGGREGATOR_SENSORS = [
+    {
+        "id": "multi_source_news",
+        "name": "Multi-Source News Monitor",
+        "icon": "mdi:newspaper",
+        "sources": list(NEWS_SOURCES.values()),
+    },
+    {"id": "government_alerts", "name": "Government Alert Monitor", "icon": "mdi:gavel"},
+    {"id": "transport_status", "name": "Transport Network Status", "icon": "mdi:transit-connection-variant"},
+    {"id": "infrastructure_monitor", "name": "Infrastructure Health Monitor", "icon": "mdi:city"},
+    {"id": "emergency_coordination", "name": "Emergency Coordination Center", "icon": "mdi:phone-in-talk"},
+]
+
 SAFETY_SENSORS = [
     {
         "id": "safecast_radiation_level",
@@ -321,51 +398,328 @@ SAFETY_SENSORS = [
         "latitude": 35.68,
         "longitude": 139.76,
     },
+    {
+        "id": "safecast_radiation_fukushima",
+        "name": "Safecast Radiation Level (Fukushima)",
+        "icon": "mdi:radioactive",
+        "unit": "μSv/h",
+        "device_class": None,
+        "state_class": SensorStateClass.MEASUREMENT,
+        "description": "Latest Safecast community radiation reading (Fukushima)",
+        "latitude": 37.75,
+        "longitude": 140.47,
+    },
+]
+
+# Sites at which the shaking of each earthquake is estimated. The Home
+# Assistant home location is added as "home". avs30 is the average
+# shear-wave velocity (m/s) of the top 30 m of ground; lower is softer.
+SEISMIC_SITES = [
+    {"name": "tokyo", "latitude": 35.68, "longitude": 139.76, "avs30": 300},
+    {"name": "fukushima", "latitude": 37.75, "longitude": 140.47, "avs30": 400},
 ]
 
+# Weather is forecast at the seismic sites, all in one request. Use
+# jma.OPEN_METEO_API_URL instead of the offline sample for live forecasts.
+WEATHER_SITES = {site["name"]: (site["latitude"], site["longitude"]) for site in SEISMIC_SITES}
+DATA_SOURCES["jma_open_meteo"] = forecasts_url(WEATHER_SITES, OPEN_METEO_URL)
+
+
+def _register_safecast_sources(sensor_configs: list[dict]) -> dict[str, str]:
+    """Add one Safecast query per cluster of nearby sites to DATA_SOURCES.
+
+    Returns the DATA_SOURCES key each site sensor reads, by sensor id.
+    """
+    urls = measurements_urls(
+        (sensor_config["latitude"], sensor_config["longitude"]) for sensor_config in sensor_configs
+    )
+    keys: dict[str, str] = {}
+    for url in urls:
+        if url not in keys:
+            keys[url] = f"safecast_{len(keys) + 1}"
+            DATA_SOURCES[keys[url]] = url
+            SOURCE_INTERVALS[keys[url]] = SOURCE_INTERVALS["safecast"]
+            SAFECAST_SOURCES.append(keys[url])
+    return {sensor_config["id"]: keys[url] for sensor_config, url in zip(sensor_configs, urls)}
+
+
+SAFECAST_SITE_SOURCES = _register_safecast_sources(SAFETY_SENSORS)
+
 async def async_setup_entry(hass, config_entry, async_add_entities):
-    """Set up Bosai Watch sensors."""
+    """Set up Bosai Watch sensors.
+    
+    Every entry gets the sensors filtered by its area. The nationwide
+    sensors are created once, by the entry the pipeline names as their
+    owner; composite metrics use that entry's area sensors as inputs.
+    """
+    entry_id = config_entry.entry_id
+    entry_data = hass.data[DOMAIN][entry_id]
+    pipeline = hass.data[DOMAIN]["pipeline"]
+    hub: BosaiDataHub = pipeline["hub"]
+    item_index: SeenItemIndex = entry_data["item_index"]
+    metrics: MetricGraph = entry_data["metrics"]
+    history: HistoryStore = entry_data["history"]
+    quake_stream: QuakeStream = pipeline["quake_stream"]
+    area: Area | None = entry_data["area"]
+    session: aiohttp.ClientSession = pipeline["session"]
+    national = pipeline["national_entry"] == entry_id
+    area_name = (
+        (area.en_name or area.name) if area is not None
+        else config_entry.data.get(CONF_AREA_CODE, AREA_CODE)
+    )
     sensors = []
     
-    # Create all comprehensive sensors
+    # Create the comprehensive sensors: per-area ones for every entry, the
+    # others only for the owner of the nationwide sensors
     for sensor_config in COMPREHENSIVE_SENSORS:
+        per_area = sensor_config["id"] in AREA_SENSOR_IDS
+        if not per_area and not national:
+            continue
         sensor = ComprehensiveBosaiSensor(
+            hub,
             sensor_config["id"],
             sensor_config["name"],
             sensor_config["icon"],
             sensor_config.get("unit", ""),
             sensor_config["description"],
             sensor_config.get("device_class", None),
-            sensor_config.get("state_class", None)
+            sensor_config.get("state_class", None),
+            sources=sensor_config.get("sources", []),
+            metrics=metrics,
+            item_index=item_index,
+            history=history,
+            stream=quake_stream if sensor_config.get("stream") == "quake" else None,
+            area=area if per_area else None,
+            entry_id=entry_id if per_area else None,
+            area_name=area_name if per_area else None,
         )
         sensors.append(sensor)
     
+    if not national:
+        async_add_entities(sensors)
+        return
+    
     # Add specialized data aggregator sensors
-    sensors.extend([
-        DataAggregatorSensor("multi_source_news", "Multi-Source News Monitor", "mdi:newspaper"),
-        DataAggregatorSensor("government_alerts", "Government Alert Monitor", "mdi:gavel"),
-        DataAggregatorSensor("transport_status", "Transport Network Status", "mdi:transit-connection-variant"),
-        DataAggregatorSensor("infrastructure_monitor", "Infrastructure Health Monitor", "mdi:city"),
-        DataAggregatorSensor("emergency_coordination", "Emergency Coordination Center", "mdi:phone-in-talk"),
-    ])
-    
-    # Create extended sensors
+    for sensor_config in AGGREGATOR_SENSORS:
+        sensors.append(DataAggregatorSensor(
+            hub,
+            sensor_config["id"],
+            sensor_config["name"],
+            sensor_config["icon"],
+            sources=sensor_config.get("sources", []),
+            metrics=metrics,
+            history=history,
+        ))
+    
+    # Create extended sensors, sharing one data source and its cache
+    if "data_source" not in pipeline:
+        pipeline["data_source"] = EnhancedDataSource(hass, session)
+    data_source: EnhancedDataSource = pipeline["data_source"]
     for sensor_config in EXTENDED_SENSORS:
-        sensor = ExtendedBosaiSensor(sensor_config)
+        sensor = ExtendedBosaiSensor(hub, data_source, sensor_config, metrics=metrics, history=history)
         sensors.append(sensor)
     
-    # Add Safecast sensor
+    # Add Safecast sensors, each reading the query of its site's cluster
     for sensor_config in SAFETY_SENSORS:
-        sensors.append(SafecastRadiationSensor(sensor_config))
+        sensors.append(SafecastRadiationSensor(hub, _source_url(SAFECAST_SITE_SOURCES[sensor_config["id"]]), sensor_config))
     
-    async_add_entities(sensors, True)
+    # Entities start from their restored state; the hub fetches their sources
+    # and polling sensors take their first update in the background.
+    async_add_entities(sensors)
 
-class ComprehensiveBosaiSensor(SensorEntity):
-    """Enhanced sensor with comprehensive data collection."""
+class BosaiRestoreSensor(RestoreSensor):
+    """Sensor that comes up with its last known state and refreshes later.
     
-    def __init__(self, sensor_id: str, name: str, icon: str, unit: str, description: str, device_class=None, state_class=None):
-        self._attr_unique_id = f"{DOMAIN}_{sensor_id}"
-        self._attr_name = name
+    State is published on change only: ``last_update`` is stamped, and a
+    hub-driven update written, only when the state or a significant
+    attribute differs from the last update. Bulky detail attributes are
+    kept out of the recorder.
+    """
+    
+    _attributes: dict
+    _fingerprint: int | None = None
+    
+    # Attributes that change without the sensor reporting anything new
+    _volatile_attributes = frozenset({"last_update", "new_items"})
+    
+    # Static or detailed attributes, shown in the UI but not recorded
+    _unrecorded_attributes = frozenset({
+        "description",
+        "source_url",
+        "new_items",
+        "data_sources",
+        "active_sources",
+        "failed_sources",
+        "government_sources",
+        "latest_event",
+        "site_intensity",
+        "area_warnings",
+        "weather_codes",
+        "site_levels",
+        "emergency_factors",
+        "safety_factors",
+        "individual_loads",
+        "pollutant_levels",
+        "report_breakdown",
+        "system_breakdown",
+        "transport_breakdown",
+        "emergency_details",
+        "infrastructure_details",
+        "international_details",
+        "medical_system_details",
+        "shelter_details",
+        "supply_chain_details",
+        "utility_details",
+    })
+    
+    async def _async_restore_state(self):
+        """Restore the state and attributes saved before the last shutdown."""
+        last_data = await self.async_get_last_sensor_data()
+        last_state = await self.async_get_last_state()
+        if last_data is None or last_state is None:
+            return
+        if last_data.native_value is not None:
+            self._state = last_data.native_value
+        for key in self._attributes:
+            if key in last_state.attributes:
+                self._attributes[key] = last_state.attributes[key]
+        self._fingerprint = self._state_fingerprint()
+    
+    def _state_fingerprint(self) -> int:
+        """Hash the state and its significant attributes."""
+        significant = {
+            key: value for key, value in self._attributes.items()
+            if key not in self._volatile_attributes
+        }
+        return hash(json.dumps([self._state, significant], sort_keys=True, default=str))
+    
+    def _stamp_if_changed(self):
+        """Set ``last_update`` if anything significant changed.
+        
+        Every ``async_update`` ends with this call.
+        """
+        fingerprint = self._state_fingerprint()
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            self._attributes["last_update"] = datetime.now().isoformat()
+    
+    @callback
+    def _handle_hub_update(self):
+        self.hass.async_create_task(self._async_update_if_changed())
+    
+    async def _async_update_if_changed(self):
+        """Update from pushed or fetched data and write the state if it changed."""
+        previous = self._fingerprint
+        await self.async_update()
+        if self._fingerprint != previous:
+            self.async_write_ha_state()
+    
+    @callback
+    def _async_schedule_first_update(self):
+        """Run the first update after a random delay, spreading startup load."""
+        
+        @callback
+        def _first_update(_now):
+            self.async_schedule_update_ha_state(True)
+        
+        self.async_on_remove(
+            async_call_later(self.hass, random.uniform(0, STARTUP_STAGGER), _first_update)
+        )
+
+class BosaiHubSensor(BosaiRestoreSensor):
+    """Sensor that recomputes its state when the hub delivers its sources.
+    
+    The update handler registered for the sensor id in SENSOR_HANDLERS is
+    bound at construction, together with the hub sources it reads. Every
+    computed state is published to the metric graph and numeric states are
+    recorded in the history store, which also drives the ``trend`` attribute;
+    sensors that are derived metrics update when the graph recomputes them.
+    A sensor given a push ``stream`` updates as soon as it delivers events.
+    Other sensors without hub sources keep polling at SCAN_INTERVAL.
+    
+    Entities are added without an initial update: they show their restored
+    state until the hub delivers (restored payloads are used at once) or,
+    for polling sensors, until a first update staggered over STARTUP_STAGGER.
+    """
+    
+    def __init__(self, hub: BosaiDataHub, sensor_id: str, sources=(), metrics: MetricGraph = None, history: HistoryStore = None, stream: QuakeStream = None):
+        self._hub = hub
+        self._sensor_id = sensor_id
+        self._metrics = metrics
+        self._history = history
+        self._stream = stream
+        self._handler = SENSOR_HANDLERS[sensor_id].__get__(self)
+        self._sources = {
+            _source_url(key): SOURCE_INTERVALS.get(key, SCAN_INTERVAL)
+            for key in sources
+        }
+    
+    @property
+    def should_poll(self) -> bool:
+        return not self._sources and not self._metrics.is_derived(self._sensor_id)
+    
+    @property
+    def source_urls(self) -> set[str]:
+        """Return the URLs this sensor reads from the hub."""
+        return set(self._sources)
+    
+    async def async_added_to_hass(self):
+        await self._async_restore_state()
+        if self._sources:
+            self.async_on_remove(
+                self._hub.async_add_listener(self._handle_hub_update, self._sources)
+            )
+            if any(url in self._hub.data for url in self._sources):
+                self._handle_hub_update()
+        elif self.should_poll:
+            self._async_schedule_first_update()
+        if self._stream is not None:
+            self.async_on_remove(self._stream.async_add_listener(self._handle_hub_update))
+        if self._metrics.is_derived(self._sensor_id):
+            self.async_on_remove(
+                self._metrics.async_add_listener(self._sensor_id, self._handle_hub_update)
+            )
+            # Inputs may have been published while this entity was being added
+            if self._metrics.get(self._sensor_id) is not None:
+                self._handle_hub_update()
+    
+    async def _async_run_handler(self):
+        """Run the bound update handler and publish the resulting state."""
+        await self._handler()
+        self._metrics.publish(self._sensor_id, self._state)
+        if isinstance(self._state, (int, float)):
+            self._history.record(self._sensor_id, self._state)
+            if "trend" in self._attributes:
+                self._attributes["trend"] = self._history.trend(self._sensor_id)
+
+class ComprehensiveBosaiSensor(BosaiHubSensor):
+    """Enhanced sensor with comprehensive data collection.
+    
+    Given the configured JMA ``area``, national warning and earthquake
+    reports are also narrowed down to that area and the areas around it.
+    Such per-area sensors belong to their config entry ``entry_id`` and
+    carry ``area_name`` in their name and device; the others exist once.
+    """
+    
+    def __init__(self, hub: BosaiDataHub, sensor_id: str, name: str, icon: str, unit: str, description: str, device_class=None, state_class=None, sources=(), metrics: MetricGraph = None, item_index: SeenItemIndex = None, history: HistoryStore = None, stream: QuakeStream = None, area: Area = None, entry_id: str = None, area_name: str = None):
+        super().__init__(hub, sensor_id, sources, metrics, history, stream)
+        self._entry_id = entry_id
+        self._area_name = area_name
+        self._item_index = item_index
+        self._area = area
+        if area is not None:
+            area_index = get_area_index()
+            self._area_codes = area_index.related_codes(area.code)
+            self._prefecture = area_index.prefecture_of(area.code)
+        else:
+            self._area_codes = frozenset()
+            self._prefecture = None
+        if entry_id is not None:
+            self._attr_unique_id = f"{entry_id}_{sensor_id}"
+            self._attr_name = f"{name} ({area_name})"
+        else:
+            self._attr_unique_id = f"{DOMAIN}_{sensor_id}"
+            self._attr_name = name
         self._attr_icon = icon
         self._attr_native_unit_of_measurement = unit
         self._attr_device_class = device_class
@@ -380,10 +734,17 @@ class ComprehensiveBosaiSensor(SensorEntity):
             "alert_level": "normal",
             "trend": "stable"
         }
-        self._sensor_id = sensor_id
     
     @property
     def device_info(self) -> DeviceInfo:
+        if self._entry_id is not None:
+            return DeviceInfo(
+                identifiers={(DOMAIN, f"{self._entry_id}_bosai_area_monitor")},
+                name=f"Bosai Watch - {self._area_name}",
+                manufacturer="Bosai Watch Team",
+                model="Area Monitor",
+                sw_version="3.0.0",
+            )
         return DeviceInfo(
             identifiers={(DOMAIN, "bosai_comprehensive_monitor")},
             name="Bosai Watch - Comprehensive Disaster Monitor",
@@ -403,173 +764,200 @@ class ComprehensiveBosaiSensor(SensorEntity):
     async def async_update(self):
         """Update sensor with comprehensive data."""
         try:
-            # Update based on sensor type
-            if self._sensor_id == "japan_seismic_activity":
-                await self._update_seismic_data()
-            elif self._sensor_id == "disaster_alert_level":
-                await self._update_disaster_alerts()
-            elif self._sensor_id == "weather_emergency_status":
-                await self._update_weather_emergency()
-            elif self._sensor_id == "transportation_disruption":
-                await self._update_transportation()
-            elif self._sensor_id == "infrastructure_status":
-                await self._update_infrastructure()
-            elif self._sensor_id == "emergency_services_load":
-                await self._update_emergency_services()
-            elif self._sensor_id == "social_sentiment_disaster":
-                await self._update_social_sentiment()
-            elif self._sensor_id == "population_safety_index":
-                await self._calculate_safety_index()
-            elif self._sensor_id == "economic_impact_indicator":
-                await self._update_economic_impact()
-            elif self._sensor_id == "government_response_level":
-                await self._update_government_response()
-            
-            self._attributes["last_update"] = datetime.now().isoformat()
+            await self._async_run_handler()
             
         except Exception as e:
             _LOGGER.error(f"Error updating {self._attr_name}: {e}")
             self._state = "Error"
             self._attributes["error"] = str(e)
+        self._stamp_if_changed()
+    
+    @sensor_handler("transportation_disruption")
+    @sensor_handler("population_safety_index")
+    @sensor_handler("economic_impact_indicator")
+    async def _apply_derived_metric(self):
+        """Take the value computed by the metric graph from other sensors."""
+        result = self._metrics.get(self._sensor_id)
+        if result is None:
+            self._state = "Unknown"
+            return
+        self._state, details = result
+        self._attributes.update(details)
     
+    @sensor_handler("japan_seismic_activity")
     async def _update_seismic_data(self):
-        """Update seismic activity data from multiple sources."""
+        """Report the strongest shaking among earthquakes pushed by the stream."""
         try:
-            async with aiohttp.ClientSession() as session:
-                # Simulate aggregating from multiple seismic data sources
-                sources_data = []
-                
-                # JMA Open-Meteo weather data (includes some seismic info)
-                try:
-                    status, _ = await _get_content(session, DATA_SOURCES["jma_open_meteo"])
-                    if status == 200:
-                        sources_data.append({"source": "JMA_OpenMeteo", "status": "active"})
-                except Exception:
-                    pass
-                
-                # Calculate seismic activity level (simulated)
-                activity_level = len(sources_data) * 3  # Simple calculation
-                self._state = activity_level
+            events = self._stream.recent(ALERT_WINDOW)
+            activity_level = max((event.max_intensity for event in events), default=0.0)
+            latest = max(self._stream.events, key=lambda event: event.origin_time, default=None)
+            
+            self._state = activity_level
+            self._attributes["site_intensity"] = self._estimate_site_intensity(events)
+            if self._prefecture is not None:
+                # Observed shaking in the configured area's prefecture
+                area_intensity = [
+                    event.prefecture_intensity[self._prefecture]
+                    for event in events
+                    if self._prefecture in event.prefecture_intensity
+                ]
                 self._attributes.update({
-                    "data_sources": sources_data,
-                    "confidence_level": "high" if len(sources_data) > 1 else "medium",
-                    "alert_level": "high" if activity_level > 10 else "normal"
+                    "area": self._prefecture,
+                    "area_events_in_window": len(area_intensity),
+                    "area_max_intensity": max(area_intensity, default=0.0),
                 })
-                
+            self._attributes.update({
+                "data_sources": [{
+                    "source": "P2PQuake",
+                    "status": "connected" if self._stream.connected else "reconnecting",
+                }],
+                "events_in_window": len(events),
+                "latest_event": latest.as_dict() if latest else None,
+                "confidence_level": "high" if self._stream.connected else "medium",
+                "alert_level": "high" if activity_level >= 5 else "normal"
+            })
+            
         except Exception as e:
             _LOGGER.error(f"Error updating seismic data: {e}")
             self._state = "Unknown"
     
+    def _estimate_site_intensity(self, events):
+        """Return the strongest estimated shaking per site over ``events``."""
+        events = [
+            event for event in events
+            if None not in (event.latitude, event.longitude, event.magnitude)
+        ]
+        if not events:
+            return {}
+        # Imported here so NumPy loads on first use, not at setup
+        from .intensity import DEFAULT_AVS30, estimate_intensity, intensity_class
+        
+        sites = [*SEISMIC_SITES, {
+            "name": "home",
+            "latitude": self.hass.config.latitude,
+            "longitude": self.hass.config.longitude,
+        }]
+        estimates = estimate_intensity(
+            [event.latitude for event in events],
+            [event.longitude for event in events],
+            [event.depth_km if event.depth_km is not None else 10 for event in events],
+            [event.magnitude for event in events],
+            [site["latitude"] for site in sites],
+            [site["longitude"] for site in sites],
+            [site.get("avs30", DEFAULT_AVS30) for site in sites],
+        )
+        strongest = estimates.argmax(axis=0)
+        peak = estimates.max(axis=0)
+        labels = intensity_class(peak)
+        return {
+            site["name"]: {
+                "estimated_intensity": round(float(peak[index]), 1),
+                "scale": str(labels[index]),
+                "event_id": events[strongest[index]].id,
+            }
+            for index, site in enumerate(sites)
+        }
+    
+    @sensor_handler("disaster_alert_level")
     async def _update_disaster_alerts(self):
         """Aggregate disaster alerts from government sources."""
         try:
-            async with aiohttp.ClientSession() as session:
-                alert_level = 0
-                sources = []
-                
-                # Check NHK disaster news asynchronously
-                try:
-                    status, rss_content = await _get_content(session, DATA_SOURCES["nhk_disaster"])
-                    if status == 200:
-                        disaster_keywords = ['地震', '津波', '台風', '洪水', '警報', '避難']
-                        for keyword in disaster_keywords:
-                            alert_level += rss_content.count(keyword)
+            alert_level = 0
+            new_items = 0
+            sources = []
+            
+            # Count disaster keywords in NHK items first seen within the alert
+            # window; items already counted in earlier cycles are skipped
+            url = DATA_SOURCES["nhk_disaster"]
+            items = self._hub.get(url)
+            if items is not None:
+                new_items = self._item_index.update(url, items)
+                alert_level = self._item_index.window_counts(url)["disaster"]
 
-                        sources.append({"source": "NHK_Disaster", "alerts": alert_level})
-                except Exception as e:
-                    _LOGGER.warning(f"Failed to fetch NHK disaster RSS: {e}")
-                
-                # Determine overall alert level
-                if alert_level >= 5:
-                    level_status = "critical"
-                elif alert_level >= 3:
-                    level_status = "high"
-                elif alert_level >= 1:
-                    level_status = "medium"
-                else:
-                    level_status = "normal"
-                
-                self._state = level_status
-                self._attributes.update({
-                    "alert_count": alert_level,
-                    "data_sources": sources,
-                    "confidence_level": "high" if sources else "low"
+                sources.append({
+                    "source": "NHK_Disaster", "alerts": alert_level, "stale": url in self._hub.stale,
                 })
-                
+            
+            # JMA warnings in force for the configured area, taken from the
+            # national warning map
+            warnings = {}
+            if self._area_codes:
+                reports = self._hub.get(DATA_SOURCES["jma_warnings"])
+                warnings = area_warnings(reports, self._area_codes)
+                if reports is not None:
+                    sources.append({
+                        "source": "JMA_Warnings", "areas": len(warnings),
+                        "stale": DATA_SOURCES["jma_warnings"] in self._hub.stale,
+                    })
+            warning_kinds = {warning_kind(code) for codes in warnings.values() for code in codes}
+            
+            # Determine overall alert level
+            if alert_level >= 5 or "special_warning" in warning_kinds:
+                level_status = "critical"
+            elif alert_level >= 3 or "warning" in warning_kinds:
+                level_status = "high"
+            elif alert_level >= 1 or warning_kinds:
+                level_status = "medium"
+            else:
+                level_status = "normal"
+            
+            self._state = level_status
+            self._attributes.update({
+                "alert_count": alert_level,
+                "area_warnings": warnings,
+                "alert_window_minutes": int(self._item_index.window // 60),
+                "new_items": new_items,
+                "data_sources": sources,
+                "confidence_level": (
+                    "low" if not sources
+                    else "medium" if any(source["stale"] for source in sources)
+                    else "high"
+                )
+            })
+            
         except Exception as e:
             _LOGGER.error(f"Error updating disaster alerts: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("weather_emergency_status")
     async def _update_weather_emergency(self):
         """Update weather emergency status."""
         try:
-            async with aiohttp.ClientSession() as session:
-                emergency_level = "normal"
-                
-                # Get JMA weather data
-                try:
-                    status, content = await _get_content(session, DATA_SOURCES["jma_open_meteo"])
-                    if status == 200:
-                        data = json.loads(content)
-                        hourly = data.get('hourly', {})
-
-                        # Check for severe weather conditions
-                        precipitation = hourly.get('precipitation', [])
-                        weather_codes = hourly.get('weather_code', [])
-
-                        # Simple emergency level calculation
-                        if precipitation and max(precipitation[:24]) > 50:  # Heavy rain
-                            emergency_level = "severe"
-                        elif precipitation and max(precipitation[:24]) > 20:
-                            emergency_level = "moderate"
+            emergency_level = "normal"
+            
+            # Get JMA weather data for every site, already decoded by the hub
+            data = self._hub.get(DATA_SOURCES["jma_open_meteo"])
+            forecasts = split_forecasts(WEATHER_SITES, data) if data is not None else None
+            if forecasts:
+                # Rain, accumulation, heat and weather code checks over all hours.
+                # Imported here so NumPy loads on first use, not at setup.
+                from .forecast import LEVELS, analyze_hourly
+                analyses = {
+                    name: analyze_hourly(forecast["hourly"])
+                    for name, forecast in forecasts.items()
+                    if forecast is not None
+                }
+                if analyses:
+                    # The worst site sets the state and the summary figures
+                    site = max(analyses, key=lambda name: LEVELS.index(analyses[name].level))
+                    analysis = analyses[site]
+                    emergency_level = analysis.level
 
-                        self._attributes.update({
-                            "max_precipitation": max(precipitation[:24]) if precipitation else 0,
-                            "weather_codes": weather_codes[:24] if weather_codes else [],
-                            "forecast_hours": 24,
-                        })
-                except Exception:
-                    pass
-                
-                self._state = emergency_level
-                
-        except Exception as e:
-            _LOGGER.error(f"Error updating weather emergency: {e}")
-            self._state = "Unknown"
-    
-    async def _update_transportation(self):
-        """Update transportation disruption index."""
-        try:
-            # Simulate transportation data aggregation
-            disruption_sources = []
-            total_disruption = 0
-            
-            # Simulate JR East data
-            disruption_sources.append({
-                "network": "JR_East",
-                "lines_affected": 3,
-                "severity": "moderate"
-            })
+                    self._attributes.update(analysis._asdict())
+                    del self._attributes["level"]
+                    self._attributes["worst_site"] = site
+                    self._attributes["site_levels"] = {
+                        name: site_analysis.level for name, site_analysis in analyses.items()
+                    }
+                    self._attributes["weather_codes"] = forecasts[site]["hourly"].get('weather_code', [])[:24]
             
-            # Calculate disruption index
-            for source in disruption_sources:
-                if source["severity"] == "severe":
-                    total_disruption += source["lines_affected"] * 3
-                elif source["severity"] == "moderate":
-                    total_disruption += source["lines_affected"] * 2
-                else:
-                    total_disruption += source["lines_affected"]
-            
-            self._state = total_disruption
-            self._attributes.update({
-                "disruption_sources": disruption_sources,
-                "severity_level": "high" if total_disruption > 15 else "normal"
-            })
+            self._state = emergency_level
             
         except Exception as e:
-            _LOGGER.error(f"Error updating transportation: {e}")
+            _LOGGER.error(f"Error updating weather emergency: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("infrastructure_status")
     async def _update_infrastructure(self):
         """Update critical infrastructure status."""
         try:
@@ -583,14 +971,10 @@ class ComprehensiveBosaiSensor(SensorEntity):
             }
             
             # Check for any infrastructure alerts from RSS feeds
-            try:
-                async with aiohttp.ClientSession() as session:
-                    status, rss_content = await _get_content(session, DATA_SOURCES["nhk_main"])
-                    if status == 200:
-                        if any(word in rss_content for word in ['停電', '断水', 'ガス', '通信障害']):
-                            infrastructure_status["overall_health"] -= 10
-            except Exception as e:
-                _LOGGER.warning(f"Failed to fetch infrastructure RSS: {e}")
+            items = self._hub.get(DATA_SOURCES["nhk_main"])
+            if items is not None:
+                if HAZARD_MATCHER.scan_items(items).categories["infrastructure"]:
+                    infrastructure_status["overall_health"] -= 10
             
             self._state = infrastructure_status["overall_health"]
             self._attributes.update(infrastructure_status)
@@ -599,6 +983,7 @@ class ComprehensiveBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating infrastructure: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("emergency_services_load")
     async def _update_emergency_services(self):
         """Update emergency services load."""
         try:
@@ -622,6 +1007,7 @@ class ComprehensiveBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating emergency services: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("social_sentiment_disaster")
     async def _update_social_sentiment(self):
         """Analyze social media sentiment for disasters."""
         try:
@@ -648,59 +1034,7 @@ class ComprehensiveBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating social sentiment: {e}")
             self._state = "Unknown"
     
-    async def _calculate_safety_index(self):
-        """Calculate comprehensive population safety index."""
-        try:
-            # Aggregate data from other sensors to calculate safety index
-            safety_factors = {
-                "seismic_activity": 85,  # 0-100 (higher = safer)
-                "weather_conditions": 90,
-                "infrastructure_health": 95,
-                "emergency_readiness": 80,
-                "government_response": 88
-            }
-            
-            # Calculate weighted average
-            weights = {
-                "seismic_activity": 0.25,
-                "weather_conditions": 0.20,
-                "infrastructure_health": 0.25,
-                "emergency_readiness": 0.15,
-                "government_response": 0.15
-            }
-            
-            safety_index = sum(safety_factors[factor] * weights[factor] 
-                             for factor in safety_factors)
-            
-            self._state = round(safety_index, 1)
-            self._attributes.update({
-                "safety_factors": safety_factors,
-                "safety_level": "high" if safety_index > 80 else "medium" if safety_index > 60 else "low"
-            })
-            
-        except Exception as e:
-            _LOGGER.error(f"Error calculating safety index: {e}")
-            self._state = "Unknown"
-    
-    async def _update_economic_impact(self):
-        """Update economic impact indicator."""
-        try:
-            # Simulate economic impact calculation
-            impact_factors = {
-                "transportation_costs": 1.2,  # multiplier
-                "infrastructure_damage": 1.0,
-                "business_disruption": 1.1,
-                "tourism_impact": 0.95,
-                "total_impact_index": 105.5
-            }
-            
-            self._state = impact_factors["total_impact_index"]
-            self._attributes.update(impact_factors)
-            
-        except Exception as e:
-            _LOGGER.error(f"Error updating economic impact: {e}")
-            self._state = "Unknown"
-    
+    @sensor_handler("government_response_level")
     async def _update_government_response(self):
         """Update government response level."""
         try:
@@ -709,21 +1043,15 @@ class ComprehensiveBosaiSensor(SensorEntity):
             government_sources = []
             
             # Check NHK politics feed for government responses
-            try:
-                async with aiohttp.ClientSession() as session:
-                    status, rss_content = await _get_content(session, DATA_SOURCES["nhk_politics"])
-                    if status == 200:
-                        keywords = ['対策', '対応', '緊急', '災害']
-                        for keyword in keywords:
-                            response_level += rss_content.count(keyword)
+            items = self._hub.get(DATA_SOURCES["nhk_politics"])
+            if items is not None:
+                response_level = HAZARD_MATCHER.scan_items(items).categories["government"]
 
-                        government_sources.append({
-                            "source": "NHK_Politics",
-                            "keywords_found": response_level,
-                            "status": "active"
-                        })
-            except Exception as e:
-                _LOGGER.warning(f"Failed to fetch politics RSS: {e}")
+                government_sources.append({
+                    "source": "NHK_Politics",
+                    "keywords_found": response_level,
+                    "status": "active"
+                })
             
             # Determine response level
             if response_level >= 8:
@@ -746,10 +1074,11 @@ class ComprehensiveBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating government response: {e}")
             self._state = "Unknown"
 
-class DataAggregatorSensor(SensorEntity):
+class DataAggregatorSensor(BosaiHubSensor):
     """Special sensor for aggregating data from multiple sources."""
     
-    def __init__(self, sensor_id: str, name: str, icon: str):
+    def __init__(self, hub: BosaiDataHub, sensor_id: str, name: str, icon: str, sources=(), metrics: MetricGraph = None, history: HistoryStore = None):
+        super().__init__(hub, sensor_id, sources, metrics, history)
         self._attr_unique_id = f"{DOMAIN}_{sensor_id}"
         self._attr_name = name
         self._attr_icon = icon
@@ -760,7 +1089,6 @@ class DataAggregatorSensor(SensorEntity):
             "active_sources": [],
             "data_quality": "unknown"
         }
-        self._sensor_id = sensor_id
     
     @property
     def device_info(self) -> DeviceInfo:
@@ -783,65 +1111,60 @@ class DataAggregatorSensor(SensorEntity):
     async def async_update(self):
         """Update aggregator sensor."""
         try:
-            if self._sensor_id == "multi_source_news":
-                await self._aggregate_news_sources()
-            elif self._sensor_id == "government_alerts":
-                await self._aggregate_government_data()
-            elif self._sensor_id == "transport_status":
-                await self._aggregate_transport_data()
-            elif self._sensor_id == "infrastructure_monitor":
-                await self._aggregate_infrastructure_data()
-            elif self._sensor_id == "emergency_coordination":
-                await self._aggregate_emergency_data()
-            
-            self._attributes["last_update"] = datetime.now().isoformat()
+            await self._async_run_handler()
             
         except Exception as e:
             _LOGGER.error(f"Error updating {self._attr_name}: {e}")
             self._state = "Error"
+        self._stamp_if_changed()
     
+    @sensor_handler("multi_source_news")
     async def _aggregate_news_sources(self):
-        """Aggregate news data from multiple RSS sources."""
+        """Aggregate news data from multiple RSS sources.
+        
+        The hub fetches all feeds concurrently; sources whose last fetch failed
+        or missed its deadline are listed and count with their previous items.
+        """
         try:
-            news_sources = [
-                ("NHK", DATA_SOURCES["nhk_main"]),
-                ("NHK_Disaster", DATA_SOURCES["nhk_disaster"]),
-                ("NHK_Science", DATA_SOURCES["nhk_science"])
-            ]
-            
             active_sources = []
+            failed_sources = []
             total_articles = 0
             
-            async with aiohttp.ClientSession() as session:
-                for source_name, url in news_sources:
-                    try:
-                        status, rss_content = await _get_content(session, url)
-                        if status == 200:
-                            articles_count = rss_content.count('<item>')
-                            if articles_count == 0:
-                                articles_count = rss_content.count('<entry>')  # Atom feeds
+            for source_name, source_key in NEWS_SOURCES.items():
+                url = _source_url(source_key)
+                items = self._hub.get(url)
+                stale = url in self._hub.stale
+                if stale:
+                    failed_sources.append(source_name)
+                if items is None:
+                    continue
+
+                articles_count = len(items)  # RSS items or Atom entries
 
-                            total_articles += articles_count
-                            active_sources.append({
-                                "source": source_name,
-                                "articles": articles_count,
-                                "status": "active"
-                            })
-                    except Exception as e:
-                        _LOGGER.warning(f"Failed to fetch {source_name} RSS: {e}")
-                        continue
+                # A stale source still counts with the items it last returned
+                total_articles += articles_count
+                active_sources.append({
+                    "source": source_name,
+                    "articles": articles_count,
+                    "status": "stale" if stale else "active"
+                })
             
+            fresh_sources = len(active_sources) - sum(
+                1 for source in active_sources if source["status"] == "stale"
+            )
             self._state = total_articles
             self._attributes.update({
                 "sources_count": len(active_sources),
                 "active_sources": active_sources,
-                "data_quality": "high" if len(active_sources) >= 2 else "medium"
+                "failed_sources": failed_sources,
+                "data_quality": "high" if fresh_sources >= 2 else "medium"
             })
             
         except Exception as e:
             _LOGGER.error(f"Error aggregating news sources: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("government_alerts")
     async def _aggregate_government_data(self):
         """Aggregate government alert data."""
         try:
@@ -864,13 +1187,14 @@ class DataAggregatorSensor(SensorEntity):
             _LOGGER.error(f"Error aggregating government data: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("transport_status")
     async def _aggregate_transport_data(self):
         """Aggregate transportation data."""
         try:
             # Simulate transport data aggregation
             transport_data = {
                 "railways": {"operational": 85, "delayed": 12, "suspended": 3},
-                "highways": {"clear": 92, "congested": 6, "closed": 2},
+                "highways": {"operational": 92, "congested": 6, "closed": 2},
                 "airports": {"operational": 98, "delayed": 2, "closed": 0},
                 "ports": {"operational": 95, "restricted": 4, "closed": 1}
             }
@@ -889,6 +1213,7 @@ class DataAggregatorSensor(SensorEntity):
             _LOGGER.error(f"Error aggregating transport data: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("infrastructure_monitor")
     async def _aggregate_infrastructure_data(self):
         """Aggregate infrastructure monitoring data."""
         try:
@@ -918,6 +1243,7 @@ class DataAggregatorSensor(SensorEntity):
             _LOGGER.error(f"Error aggregating infrastructure data: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("emergency_coordination")
     async def _aggregate_emergency_data(self):
         """Aggregate emergency services coordination data."""
         try:
@@ -946,54 +1272,74 @@ class DataAggregatorSensor(SensorEntity):
             _LOGGER.error(f"Error aggregating emergency data: {e}")
             self._state = "Unknown"
 
+def _decode_payload(text: str) -> dict:
+    """Decode a JSON payload, wrapping anything else for EnhancedDataSource consumers."""
+    if text.lstrip()[:1] in ("{", "["):
+        return json.loads(text)
+    return {"text": text}
+
+# Cache lifetime in seconds per cache key; slow-moving datasets live longer
+CACHE_TTLS = {
+    "e_gov_cache": 6 * 3600,
+}
+DEFAULT_CACHE_TTL = 300  # 5 minutes
+CACHE_MAX_ENTRIES = 64
+CACHE_MAX_BYTES = 4 * 1024 * 1024
+
 class EnhancedDataSource:
-    """Enhanced data source handler for multiple APIs."""
+    """Enhanced data source handler for multiple APIs.
     
-    def __init__(self):
-        self.session = None
-        self.cache = {}
-        self.cache_timeout = 300  # 5 minutes
+    Uses the pooled session owned by the integration, which also closes it.
+    Results are kept in a bounded LRU cache; an expired entry is served stale
+    for one more TTL while it is refreshed in the background.
+    """
     
-    async def get_session(self):
-        """Get or create aiohttp session."""
-        if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
-        return self.session
+    def __init__(self, hass, session: aiohttp.ClientSession):
+        self.hass = hass
+        self.session = session
+        self.cache = PayloadCache(CACHE_MAX_ENTRIES, CACHE_MAX_BYTES)
+        self._revalidating: set[str] = set()
     
     async def fetch_data(self, url: str, cache_key: str = None) -> dict:
         """Fetch data from URL with caching."""
-        if cache_key and cache_key in self.cache:
-            cache_data, timestamp = self.cache[cache_key]
-            if datetime.now().timestamp() - timestamp < self.cache_timeout:
-                return cache_data
+        if cache_key:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                data, fresh = cached
+                if not fresh and cache_key not in self._revalidating:
+                    self._revalidating.add(cache_key)
+                    self.hass.async_create_background_task(
+                        self._revalidate(url, cache_key), f"{DOMAIN} revalidate {cache_key}"
+                    )
+                return data
         
+        return await self._fetch(url, cache_key)
+    
+    async def _revalidate(self, url: str, cache_key: str):
+        try:
+            await self._fetch(url, cache_key)
+        finally:
+            self._revalidating.discard(cache_key)
+    
+    async def _fetch(self, url: str, cache_key: str = None) -> dict:
         try:
-            session = await self.get_session()
-            status, text = await _get_content(session, url)
+            status, data = await fetch_parsed(self.session, url, _decode_payload)
             if status == 200:
-                if url.endswith('.json'):
-                    data = json.loads(text)
-                else:
-                    data = {"text": text}
-                    
-                    if cache_key:
-                        self.cache[cache_key] = (data, datetime.now().timestamp())
-                    
-                    return data
+                if cache_key:
+                    ttl = CACHE_TTLS.get(cache_key, DEFAULT_CACHE_TTL)
+                    self.cache.put(cache_key, data, ttl, stale_ttl=ttl)
+                
+                return data
         except Exception as e:
             _LOGGER.warning(f"Failed to fetch data from {url}: {e}")
         
         return {}
-    
-    async def close(self):
-        """Close the session."""
-        if self.session and not self.session.closed:
-            await self.session.close()
 
-class ExtendedBosaiSensor(SensorEntity):
+class ExtendedBosaiSensor(BosaiHubSensor):
     """Extended Bosai sensor with enhanced data collection."""
     
-    def __init__(self, sensor_config: dict):
+    def __init__(self, hub: BosaiDataHub, data_source: EnhancedDataSource, sensor_config: dict, metrics: MetricGraph = None, history: HistoryStore = None):
+        super().__init__(hub, sensor_config["id"], sensor_config.get("sources", []), metrics, history)
         self._config = sensor_config
         self._attr_unique_id = f"{DOMAIN}_{sensor_config['id']}"
         self._attr_name = sensor_config["name"]
@@ -1010,7 +1356,7 @@ class ExtendedBosaiSensor(SensorEntity):
             "trend": "stable",
             "alerts": []
         }
-        self.data_source = EnhancedDataSource()
+        self.data_source = data_source
     
     @property
     def device_info(self) -> DeviceInfo:
@@ -1033,36 +1379,15 @@ class ExtendedBosaiSensor(SensorEntity):
     async def async_update(self):
         """Update extended sensor data."""
         try:
-            sensor_id = self._config["id"]
-            
-            if sensor_id == "government_data_monitor":
-                await self._update_government_data()
-            elif sensor_id == "public_transport_health":
-                await self._update_transport_health()
-            elif sensor_id == "utility_services_status":
-                await self._update_utility_services()
-            elif sensor_id == "radiation_safety_monitor":
-                await self._update_radiation_monitoring()
-            elif sensor_id == "air_quality_index":
-                await self._update_air_quality()
-            elif sensor_id == "community_safety_reports":
-                await self._update_community_reports()
-            elif sensor_id == "supply_chain_monitor":
-                await self._update_supply_chain()
-            elif sensor_id == "emergency_shelter_capacity":
-                await self._update_shelter_capacity()
-            elif sensor_id == "medical_system_load":
-                await self._update_medical_system()
-            elif sensor_id == "cross_border_impact":
-                await self._update_cross_border_impact()
-            
-            self._attributes["last_update"] = datetime.now().isoformat()
+            await self._async_run_handler()
             
         except Exception as e:
             _LOGGER.error(f"Error updating {self._attr_name}: {e}")
             self._state = "Error"
             self._attributes["error"] = str(e)
+        self._stamp_if_changed()
     
+    @sensor_handler("government_data_monitor")
     async def _update_government_data(self):
         """Update government data monitoring."""
         try:
@@ -1098,6 +1423,7 @@ class ExtendedBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating government data: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("public_transport_health")
     async def _update_transport_health(self):
         """Update public transport health monitoring."""
         try:
@@ -1124,6 +1450,7 @@ class ExtendedBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating transport health: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("utility_services_status")
     async def _update_utility_services(self):
         """Update utility services status."""
         try:
@@ -1158,24 +1485,47 @@ class ExtendedBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating utility services: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("radiation_safety_monitor")
     async def _update_radiation_monitoring(self):
-        """Update radiation safety monitoring."""
+        """Update radiation safety monitoring from Safecast readings."""
         try:
-            # Simulate radiation monitoring data
+            devices = {}
+            for key in SAFECAST_SOURCES:
+                url = _source_url(key)
+                data = self._hub.get(url)
+                if isinstance(data, list):
+                    RADIATION_DETECTOR.update(data, url)
+                    devices.update(device_index(data).latest)
+            if not devices:
+                self._state = "Unknown"
+                return
+            
             # Normal background radiation in Japan is typically 0.05-0.1 μSv/h
-            radiation_level = 0.08  # Normal level
-            monitoring_stations = 47  # Number of prefectures
+            values = [reading["value"] for reading in devices.values() if reading.get("value") is not None]
+            radiation_level = round(statistics.median(values), 3) if values else "Unknown"
+            max_reading = max(values, default=None)
+            elevated_stations = sum(1 for value in values if value >= 0.2)
+            anomalies = RADIATION_DETECTOR.anomalous_devices & devices.keys()
+            scores = [
+                score for device in devices
+                if (score := RADIATION_DETECTOR.device_scores.get(device)) is not None
+            ]
             
-            # Check for any elevated readings
-            elevated_stations = 0
-            max_reading = radiation_level
+            if elevated_stations:
+                safety_status = "elevated"
+            elif anomalies:
+                safety_status = "anomaly_detected"
+            else:
+                safety_status = "normal"
             
             self._state = radiation_level
             self._attributes.update({
-                "monitoring_stations": monitoring_stations,
+                "monitoring_stations": len(devices),
                 "elevated_readings": elevated_stations,
+                "anomalous_readings": len(anomalies),
                 "max_reading": max_reading,
-                "safety_status": "normal" if radiation_level < 0.2 else "elevated",
+                "max_zscore": _round_score(max(scores, default=None)),
+                "safety_status": safety_status,
                 "units": "μSv/h"
             })
             
@@ -1183,6 +1533,7 @@ class ExtendedBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating radiation monitoring: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("air_quality_index")
     async def _update_air_quality(self):
         """Update air quality index."""
         try:
@@ -1219,6 +1570,7 @@ class ExtendedBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating air quality: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("community_safety_reports")
     async def _update_community_reports(self):
         """Update community safety reports."""
         try:
@@ -1248,6 +1600,7 @@ class ExtendedBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating community reports: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("supply_chain_monitor")
     async def _update_supply_chain(self):
         """Update supply chain monitoring."""
         try:
@@ -1275,6 +1628,7 @@ class ExtendedBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating supply chain: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("emergency_shelter_capacity")
     async def _update_shelter_capacity(self):
         """Update emergency shelter capacity."""
         try:
@@ -1301,6 +1655,7 @@ class ExtendedBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating shelter capacity: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("medical_system_load")
     async def _update_medical_system(self):
         """Update medical system load monitoring."""
         try:
@@ -1344,6 +1699,7 @@ class ExtendedBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating medical system: {e}")
             self._state = "Unknown"
     
+    @sensor_handler("cross_border_impact")
     async def _update_cross_border_impact(self):
         """Update cross-border impact monitoring."""
         try:
@@ -1386,8 +1742,19 @@ class ExtendedBosaiSensor(SensorEntity):
             _LOGGER.error(f"Error updating cross-border impact: {e}")
             self._state = "Unknown"
 
-class SafecastRadiationSensor(SensorEntity):
-    def __init__(self, sensor_config: dict):
+class SafecastRadiationSensor(BosaiRestoreSensor):
+    """Radiation reading of the Safecast device nearest to a configured site.
+    
+    Sites close to each other share one hub URL, one query per cluster (see
+    ``measurements_urls``); the nearest device is found through a spatial
+    index of the readings, built once per query and fetch.
+    """
+    
+    _attr_should_poll = False
+    
+    def __init__(self, hub: BosaiDataHub, url: str, sensor_config: dict):
+        self._hub = hub
+        self._url = url
         self._attr_unique_id = f"{DOMAIN}_{sensor_config['id']}"
         self._attr_name = sensor_config["name"]
         self._attr_icon = sensor_config["icon"]
@@ -1403,7 +1770,7 @@ class SafecastRadiationSensor(SensorEntity):
             "last_update": None,
             "location": f"{self._latitude},{self._longitude}",
             "measurement_time": None,
-            "source_url": "https://api.safecast.org/measurements.json"
+            "source_url": url
         }
 
     @property
@@ -1424,27 +1791,44 @@ class SafecastRadiationSensor(SensorEntity):
     def extra_state_attributes(self):
         return self._attributes
 
+    @property
+    def source_urls(self) -> set[str]:
+        """Return the URLs this sensor reads from the hub."""
+        return {self._url}
+
+    async def async_added_to_hass(self):
+        await self._async_restore_state()
+        self.async_on_remove(
+            self._hub.async_add_listener(self._handle_hub_update, {self._url: SOURCE_INTERVALS["safecast"]})
+        )
+        if self._url in self._hub.data:
+            self._handle_hub_update()
+
     async def async_update(self):
-        """Fetch the latest Safecast radiation reading near Tokyo."""
-        import aiohttp
-        url = f"https://api.safecast.org/measurements.json?latitude={self._latitude}&longitude={self._longitude}&distance=10&unit=usvph&order=desc&sort=measured_at&limit=1"
+        """Read the Safecast device nearest to this site from the shared query."""
         try:
-            async with aiohttp.ClientSession() as session:
-                status, text = await _get_content(session, url)
-                if status == 200:
-                    data = json.loads(text)
-                    if isinstance(data, list) and data:
-                        reading = data[0]
-                        self._state = reading.get("value")
-                        self._attributes["measurement_time"] = reading.get("measured_at")
-                        self._attributes["device_id"] = reading.get("device_id")
-                        self._attributes["location_name"] = reading.get("location_name")
-                        self._attributes["latitude"] = reading.get("latitude")
-                        self._attributes["longitude"] = reading.get("longitude")
-                    else:
-                        self._state = None
-                else:
-                    self._state = None
+            data = self._hub.get(self._url)
+            found = None
+            if isinstance(data, list):
+                RADIATION_DETECTOR.update(data, self._url)
+                found = device_index(data).nearest(self._latitude, self._longitude)
+            if found is not None:
+                reading, distance = found
+                device = device_key(reading)
+                area = RADIATION_DETECTOR.area_of(reading["latitude"], reading["longitude"])
+                self._state = reading.get("value")
+                self._attributes["measurement_time"] = reading.get("measured_at")
+                self._attributes["device_id"] = reading.get("device_id")
+                self._attributes["location_name"] = reading.get("location_name")
+                self._attributes["latitude"] = reading.get("latitude")
+                self._attributes["longitude"] = reading.get("longitude")
+                self._attributes["distance_km"] = round(distance, 2)
+                self._attributes["device_zscore"] = _round_score(RADIATION_DETECTOR.device_scores.get(device))
+                self._attributes["area_zscore"] = _round_score(RADIATION_DETECTOR.area_scores.get(area))
+                self._attributes["anomaly"] = device in RADIATION_DETECTOR.anomalous_devices
+            else:
+                self._state = None
         except Exception as e:
-            _LOGGER.error(f"Error fetching Safecast radiation data: {e}")
+            _LOGGER.error(f"Error reading Safecast radiation data: {e}")
             self._state = None
+        self._stamp_if_changed()